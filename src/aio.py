@@ -0,0 +1,201 @@
+import asyncio
+import time
+from typing import AsyncIterator
+
+from src import stats
+from src.retry import ResilientExecutor
+from src.youtube import YouTubeMixin
+
+BASE_URL = 'https://www.googleapis.com/youtube/v3/'
+
+
+class _ResponseInfo(dict):
+    """Заголовки ответа (ключи в нижнем регистре) со статусом в атрибуте `status`, как httplib2.Response."""
+    def __init__(self, status: int, headers: dict) -> None:
+        super().__init__((key.lower(), value) for key, value in headers.items())
+        self.status = status
+
+
+class AsyncHttpError(Exception):
+    """
+    Ошибка ответа API в асинхронном клиенте.
+
+    Как и googleapiclient.errors.HttpError, хранит статус и заголовки в `resp` и тело ответа в `content`,
+    поэтому классифицируется и повторяется ResilientExecutor так же, как ошибки синхронного клиента.
+    """
+    def __init__(self, status: int, headers: dict, content: bytes) -> None:
+        """
+        :param status: HTTP-статус ответа.
+        :param headers: Заголовки ответа.
+        :param content: Тело ответа.
+        """
+        self.resp = _ResponseInfo(status, headers)
+        self.content = content
+        super().__init__(f'HTTP {status}: {content[:500].decode("utf-8", "replace")}')
+
+
+class AsyncRateLimiter:
+    """Ограничивает количество запросов в секунду, равномерно распределяя их во времени."""
+    def __init__(self, rate: float) -> None:
+        """
+        :param rate: Максимальное количество запросов в секунду.
+        """
+        self.interval = 1 / rate
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Дожидается, пока можно будет отправить следующий запрос."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncYouTubeClient:
+    """
+    Асинхронный клиент YouTube Data API v3 на aiohttp.
+
+    Количество одновременных запросов ограничивается семафором, а частота запросов -
+    AsyncRateLimiter. Сессия и примитивы синхронизации создаются заново для каждого цикла событий;
+    сессия закрывается при завершении своего цикла (asyncio.run) или, если цикл был остановлен
+    иначе, при переходе клиента в новый цикл.
+    aiohttp импортируется только при создании клиента, чтобы не замедлять импорт проекта.
+
+    Ограничения частоты, временные сбои и исчерпание квоты обрабатываются тем же ResilientExecutor,
+    что и у синхронного клиента (по умолчанию общим с YouTubeMixin.YOUTUBE).
+    """
+    def __init__(self, api_key: str | None = None, concurrency: int = 32, rate_limit: float | None = None,
+                 executor: ResilientExecutor | None = None) -> None:
+        """
+        :param api_key: Ключ YouTube API. По умолчанию берется из YouTubeMixin.API_KEY.
+        :param concurrency: Максимальное количество одновременных запросов.
+        :param rate_limit: Максимальное количество запросов в секунду или None без ограничения.
+        :param executor: Слой повторов и ограничения частоты (по умолчанию executor синхронного клиента).
+        :raises ImportError: Если не установлен aiohttp.
+        """
+        try:
+            import aiohttp
+        except ImportError as error:
+            raise ImportError('Для асинхронного клиента необходимо установить aiohttp: pip install aiohttp') from error
+        self._aiohttp = aiohttp
+        self.api_key = api_key if api_key is not None else YouTubeMixin.API_KEY
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.executor = executor if executor is not None else YouTubeMixin.YOUTUBE.executor
+        self._loop = None
+        self._session = None
+        self._session_guard = None
+        self._semaphore = None
+        self._limiter = None
+
+    async def _bind(self) -> None:
+        """Создает сессию и примитивы синхронизации для текущего цикла событий, закрывая прежнюю сессию."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and not self._session.closed:
+            return
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._loop = loop
+        self._session = self._aiohttp.ClientSession(base_url=BASE_URL)
+        self._session_guard = self._close_at_shutdown(self._session)
+        await anext(self._session_guard)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = AsyncRateLimiter(self.rate_limit) if self.rate_limit else None
+
+    @staticmethod
+    async def _close_at_shutdown(session) -> AsyncIterator[None]:
+        """
+        Закрывает сессию, когда цикл событий завершает асинхронные генераторы.
+
+        asyncio.run перед закрытием цикла вызывает loop.shutdown_asyncgens(), который завершает
+        этот приостановленный генератор, так что сессия закрывается в своем цикле.
+        """
+        try:
+            yield
+        finally:
+            if not session.closed:
+                await session.close()
+
+    async def list(self, resource: str, **params) -> dict:
+        """
+        Выполняет запрос resource.list и возвращает ответ API.
+
+        :param resource: Ресурс API, например 'videos'.
+        :param params: Параметры запроса (part, id, pageToken и т. д.).
+        :raises AsyncHttpError: Если API вернул ошибку, которую не нужно повторять, или попытки закончились.
+        :raises QuotaExhaustedError: Если дневная квота исчерпана.
+        """
+        await self._bind()
+        query = {key: str(value) for key, value in params.items() if value is not None}
+        if self.api_key:
+            query['key'] = self.api_key
+
+        async def attempt() -> dict:
+            async with self._semaphore:
+                if self._limiter is not None:
+                    await self._limiter.wait()
+                stats.charge(resource, 'list')
+                try:
+                    async with self._session.get(resource, params=query) as response:
+                        if response.status >= 400:
+                            raise AsyncHttpError(response.status, dict(response.headers), await response.read())
+                        return await response.json()
+                except self._aiohttp.ClientConnectionError as error:
+                    raise ConnectionError(str(error)) from error
+
+        start = time.perf_counter()
+        data = await self.executor.acall(attempt)
+        if stats.active():
+            stats.record(resource, 'list', params, data, time.perf_counter() - start)
+        return data
+
+    async def aclose(self) -> None:
+        """Закрывает HTTP-сессию."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> 'AsyncYouTubeClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+_client: AsyncYouTubeClient | None = None
+
+
+def get_client() -> AsyncYouTubeClient:
+    """Возвращает общий асинхронный клиент, создавая его при первом обращении."""
+    global _client
+    if _client is None:
+        _client = AsyncYouTubeClient()
+    return _client
+
+
+def set_client(client: AsyncYouTubeClient | None) -> None:
+    """
+    Задает общий асинхронный клиент, например с другими ограничениями параллелизма.
+
+    :param client: Клиент или None, чтобы при следующем обращении создать клиент по умолчанию.
+    """
+    global _client
+    _client = client
+
+
+async def iter_pages(resource: str, **params) -> AsyncIterator[dict]:
+    """
+    Асинхронно перебирает страницы ответа, следуя по `nextPageToken`.
+
+    :param resource: Ресурс API, например 'playlistItems'.
+    :param params: Параметры запроса.
+    """
+    page_token = params.pop('pageToken', None)
+    while True:
+        page = await get_client().list(resource, pageToken=page_token, **params)
+        yield page
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
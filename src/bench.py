@@ -0,0 +1,168 @@
+"""
+Набор бенчмарков для классов проекта на синтетическом API без сети.
+
+Запуск:
+    python -m src.bench                                  # вывести результаты
+    python -m src.bench --json results.json              # сохранить результаты
+    python -m src.bench --compare baseline.json          # завершиться с кодом 1 при регрессии
+
+Для каждого сценария измеряются количество запросов к API, время выполнения (лучшее из повторов)
+и пиковый объем выделенной памяти (tracemalloc).
+
+Базовые результаты для `-n 200` хранятся в tests/bench_baseline.json; тест tests/test_offline.py
+проверяет по ним количество запросов. После намеренного изменения их можно обновить командой
+    python -m src.bench -n 200 --json tests/bench_baseline.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from src.channel import Channel
+from src.durations import DurationIndex
+from src.playlist import PlayList
+from src.replay import SyntheticHttp
+from src.stats import youtube_stats
+from src.video import Video
+from src.youtube import YouTubeMixin, build_service
+
+BENCHMARKS: dict[str, Callable[[int], object]] = {}
+
+
+def benchmark(name: str):
+    """Регистрирует функцию сценария, принимающую масштаб (количество объектов)."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+@benchmark('channel_init')
+def channel_init(size: int) -> None:
+    for number in range(size):
+        Channel(f'UC{number}')
+
+
+@benchmark('channel_bulk')
+def channel_bulk(size: int) -> None:
+    Channel.bulk(f'UC{number}' for number in range(size))
+
+
+@benchmark('video_init')
+def video_init(size: int) -> None:
+    for number in range(size):
+        Video(f'video-{number}')
+
+
+@benchmark('video_bulk')
+def video_bulk(size: int) -> None:
+    Video.bulk(f'video-{number}' for number in range(size))
+
+
+@benchmark('playlist_total_duration')
+def playlist_total_duration(size: int) -> None:
+    PlayList.DURATIONS.clear()
+    PlayList('PLbench').total_duration
+
+
+@benchmark('playlist_show_best_video')
+def playlist_show_best_video(size: int) -> None:
+    PlayList('PLbench').show_best_video()
+
+
+def run(names: list[str] | None = None, size: int = 1000, repeat: int = 3) -> dict[str, dict]:
+    """
+    Выполняет сценарии на SyntheticHttp.
+
+    На время выполнения подставляются синтетическая служба API, пустой кэш и собственный индекс
+    длительностей в памяти; прежние служба, кэш и индекс восстанавливаются после завершения.
+
+    :param names: Названия сценариев или None для всех.
+    :param size: Количество объектов (и видео в плейлисте).
+    :param repeat: Количество повторов для измерения времени.
+    :return: Словарь {сценарий: {'calls': ..., 'seconds': ..., 'peak_bytes': ...}}.
+    """
+    client = YouTubeMixin.YOUTUBE
+    previous_service = client._service if client._injected else None
+    previous_cache = client.cache
+    previous_durations = PlayList.DURATIONS
+    YouTubeMixin.set_service(build_service(http=SyntheticHttp(playlist_size=size)))
+    YouTubeMixin.set_cache(None)
+    PlayList.DURATIONS = DurationIndex()
+    results = {}
+    try:
+        for name in names or BENCHMARKS:
+            function = BENCHMARKS[name]
+            with youtube_stats() as stats:
+                function(size)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                function(size)
+                best = min(best, time.perf_counter() - start)
+            tracemalloc.start()
+            function(size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {'calls': stats.network_calls, 'seconds': best, 'peak_bytes': peak}
+    finally:
+        YouTubeMixin.set_service(previous_service)
+        YouTubeMixin.set_cache(previous_cache)
+        PlayList.DURATIONS = previous_durations
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Сравнивает результаты с базовыми.
+
+    :param tolerance: Допустимый относительный рост времени и памяти (0.2 = 20 %).
+    :return: Описания регрессий. Любой рост количества запросов считается регрессией.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['calls'] > base['calls']:
+            regressions.append(f"{name}: запросов {base['calls']} -> {result['calls']}")
+        for metric in ('seconds', 'peak_bytes'):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f'{name}: {metric} {base[metric]:.4g} -> {result[metric]:.4g}')
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Точка входа `python -m src.bench`."""
+    parser = argparse.ArgumentParser(prog='python -m src.bench', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('names', nargs='*', help=f"сценарии (по умолчанию все): {', '.join(BENCHMARKS)}")
+    parser.add_argument('-n', '--size', type=int, default=1000, help='количество объектов в сценарии')
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('--json', help='сохранить результаты в файл')
+    parser.add_argument('--compare', help='файл с базовыми результатами')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    results = run(args.names, args.size, args.repeat)
+    print(f"{'сценарий':<28}{'запросов':>10}{'время, с':>12}{'память, КБ':>14}")
+    for name, result in results.items():
+        print(f"{name:<28}{result['calls']:>10}{result['seconds']:>12.4f}{result['peak_bytes'] / 1024:>14.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f'РЕГРЕССИЯ {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
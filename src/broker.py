@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Callable
+
+from src.cache import ResponseCache
+from src.fields import merge_masks
+
+MAX_BATCH = 50
+
+
+class _Call:
+    """Результат запроса, который ожидают несколько потоков."""
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self) -> dict:
+        """Дожидается результата и возвращает его или вызывает исключение ведущего потока."""
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _Batch(_Call):
+    """Пачка одиночных запросов, объединяемых в один запрос с несколькими id."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.ids: dict[str, None] = {}
+        self.params: list[dict] = []
+        self.closed = False
+
+
+class RequestBroker:
+    """
+    Потокобезопасный посредник между объектами проекта и API.
+
+    Одинаковые запросы, выполняющиеся одновременно, отправляются один раз (single-flight):
+    остальные потоки ждут и получают тот же ответ. Если задано batch_window, одиночные
+    запросы videos/channels по одному id, пришедшие в течение этого окна, объединяются
+    в один запрос до 50 id, и каждый поток получает ответ только со своим элементом.
+    Запросы с разными `part` и `fields` объединяются с общей маской, покрывающей их все.
+    """
+    def __init__(self, batch_window: float = 0.0, max_batch: int = MAX_BATCH,
+                 batch_resources: tuple[str, ...] = ('videos', 'channels')) -> None:
+        """
+        :param batch_window: Окно накопления одиночных запросов в секундах; 0 отключает объединение.
+        :param max_batch: Максимальное количество id в объединенном запросе.
+        :param batch_resources: Ресурсы, запросы к которым можно объединять по id.
+        """
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batch_resources = batch_resources
+        self._lock = threading.Lock()
+        self._inflight: dict[str, _Call] = {}
+        self._batches: dict[str, _Batch] = {}
+
+    def execute(self, request, send: Callable) -> dict:
+        """
+        Выполняет запрос через send, объединяя его с одинаковыми или однотипными запросами.
+
+        :param request: Запрос к API (ApiRequest).
+        :param send: Функция, выполняющая запрос и возвращающая ответ.
+        :return: Ответ API.
+        """
+        if self._is_batchable(request):
+            return self._execute_batched(request, send)
+        return self._single_flight(request, send)
+
+    def _is_batchable(self, request) -> bool:
+        """Возвращает True для запроса list по одному id к ресурсу из batch_resources."""
+        resource_id = request.params.get('id')
+        return (self.batch_window > 0 and request.resource in self.batch_resources and request.method == 'list'
+                and isinstance(resource_id, str) and ',' not in resource_id)
+
+    def _single_flight(self, request, send: Callable) -> dict:
+        """Выполняет запрос, если такой же запрос еще не выполняется, иначе ждет его результата."""
+        key = ResponseCache.make_key(request.resource, request.method, request.params)
+        with self._lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[key] = _Call()
+        if not is_leader:
+            return call.wait()
+        try:
+            call.result = send(request)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.event.set()
+        return call.result
+
+    def _execute_batched(self, request, send: Callable) -> dict:
+        """Добавляет запрос в текущую пачку и возвращает ответ с элементом запрошенного id."""
+        resource_id = request.params['id']
+        group = ResponseCache.make_key(request.resource, request.method,
+                                       {key: value for key, value in request.params.items()
+                                        if key not in ('id', 'part', 'fields')})
+        with self._lock:
+            batch = self._batches.get(group)
+            is_leader = batch is None or batch.closed or len(batch.ids) >= self.max_batch
+            if is_leader:
+                batch = self._batches[group] = _Batch()
+            batch.ids[resource_id] = None
+            batch.params.append(request.params)
+
+        if is_leader:
+            time.sleep(self.batch_window)
+            with self._lock:
+                batch.closed = True
+                if self._batches.get(group) is batch:
+                    del self._batches[group]
+            part, fields = merge_masks(batch.params)
+            params = {**request.params, 'id': ','.join(batch.ids), 'part': part, 'fields': fields}
+            merged = type(request)(request.client, request.resource, request.method, params)
+            try:
+                batch.result = self._single_flight(merged, send)
+            except BaseException as error:
+                batch.error = error
+            batch.event.set()
+
+        response = batch.wait()
+        items = [item for item in response.get('items', []) if item.get('id') == resource_id]
+        return {**{key: value for key, value in response.items() if key not in ('items', 'pageInfo')},
+                'items': items}
@@ -0,0 +1,211 @@
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Время жизни ответа в секундах для части (part) или пары (ресурс, часть).
+# Статистика меняется быстро, описания и длительности почти не меняются.
+# Страницы плейлистов меняются с каждым новым видео, поэтому хранятся недолго.
+DEFAULT_TTLS = {
+    'statistics': 60 * 60,
+    'snippet': 7 * 24 * 60 * 60,
+    'contentDetails': 30 * 24 * 60 * 60,
+    ('playlistItems', 'snippet'): 15 * 60,
+    ('playlistItems', 'contentDetails'): 15 * 60,
+}
+DEFAULT_TTL = 24 * 60 * 60
+
+# Соединения SQLite, унаследованные дочерним процессом после fork. Их нельзя ни использовать,
+# ни закрывать (закрытие снимает блокировки файла родительского процесса), поэтому они
+# только удерживаются от сборки мусора до завершения процесса.
+_INHERITED_CONNECTIONS: list[sqlite3.Connection] = []
+
+
+def process_connection(owner, connect) -> sqlite3.Connection:
+    """
+    Возвращает соединение SQLite владельца для текущего процесса.
+
+    Соединение хранится в атрибутах `_connection` и `_pid` владельца. После fork дочерний
+    процесс открывает собственное соединение вместо унаследованного от родителя.
+
+    :param owner: Объект, которому принадлежит соединение.
+    :param connect: Функция, открывающая новое соединение.
+    """
+    if owner._pid != os.getpid():
+        if owner._connection is not None:
+            _INHERITED_CONNECTIONS.append(owner._connection)
+        owner._connection = connect()
+        owner._pid = os.getpid()
+    return owner._connection
+
+
+class CacheEntry:
+    """Сохраненный ответ API."""
+    def __init__(self, response: dict, etag: str | None, stored_at: float) -> None:
+        """
+        :param response: Ответ API.
+        :param etag: Значение поля `etag` ответа.
+        :param stored_at: Время сохранения (unix time).
+        """
+        self.response = response
+        self.etag = etag
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl: float, now: float | None = None) -> bool:
+        """Возвращает True, если запись моложе ttl секунд."""
+        return (now or time.time()) - self.stored_at < ttl
+
+
+class ResponseCache(abc.ABC):
+    """
+    Базовый класс кэша ответов API.
+
+    Наследники реализуют методы `get`, `set` и `touch`.
+    """
+    def __init__(self, ttls: dict[str | tuple[str, str], float] | None = None,
+                 default_ttl: float = DEFAULT_TTL) -> None:
+        """
+        :param ttls: Время жизни ответа по частям или по парам (ресурс, часть), например
+            {'statistics': 600, ('playlistItems', 'snippet'): 60}. Пара важнее части.
+        :param default_ttl: Время жизни для частей, не указанных в ttls.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def make_key(resource: str, method: str, params: dict) -> str:
+        """
+        Возвращает ключ кэша для запроса.
+
+        :param resource: Ресурс API, например 'videos'.
+        :param method: Метод ресурса, например 'list'.
+        :param params: Параметры запроса (part, id, pageToken и т. д.).
+        """
+        return f'{resource}.{method}:' + json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+    def ttl_for(self, resource: str, params: dict) -> float:
+        """Возвращает время жизни ответа ресурса: минимальное среди запрошенных частей."""
+        parts = [part.strip() for part in str(params.get('part', '')).split(',')]
+        return min(self.ttls.get((resource, part), self.ttls.get(part, self.default_ttl)) for part in parts)
+
+    @abc.abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Возвращает запись по ключу или None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, response: dict) -> None:
+        """Сохраняет ответ под ключом."""
+
+    @abc.abstractmethod
+    def touch(self, key: str) -> None:
+        """Продлевает запись после подтверждения сервером (ответ 304 Not Modified)."""
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Кэш ответов API в файле SQLite с вытеснением давно не использованных записей (LRU).
+
+    Каждый процесс работает через собственное соединение, поэтому кэш можно использовать
+    в процессах, созданных через fork.
+
+    Чтение из кэша не пишет в базу: время последнего обращения копится в памяти и записывается
+    одной транзакцией при сохранении ответа или после access_flush_size обращений. База работает
+    в режиме WAL с synchronous=NORMAL, так что фиксация транзакции не ждет синхронизации диска.
+    """
+    def __init__(self, path: str, max_entries: int = 100_000, access_flush_size: int = 1000, **kwargs) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        :param max_entries: Максимальное количество записей в кэше.
+        :param access_flush_size: Через сколько обращений записывать накопленное время обращений.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_entries = max_entries
+        self.access_flush_size = access_flush_size
+        self._accessed: dict[str, float] = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = None
+        self._pid = None
+        connection = self._db
+        connection.execute('CREATE TABLE IF NOT EXISTS responses ('
+                           'key TEXT PRIMARY KEY, response TEXT NOT NULL, etag TEXT, '
+                           'stored_at REAL NOT NULL, accessed_at REAL NOT NULL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего процесса."""
+        return process_connection(self, self._connect)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._db.execute('SELECT response, etag, stored_at FROM responses WHERE key = ?',
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.access_flush_size:
+                self._flush_accessed()
+                self._db.commit()
+        response, etag, stored_at = row
+        return CacheEntry(json.loads(response), etag, stored_at)
+
+    def set(self, key: str, response: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._flush_accessed()
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                             (key, json.dumps(response, ensure_ascii=False), response.get('etag'), now, now))
+            self._evict()
+            self._db.commit()
+
+    def _flush_accessed(self) -> None:
+        """Записывает накопленное время обращений к записям (без фиксации транзакции)."""
+        if self._accessed:
+            self._db.executemany('UPDATE responses SET accessed_at = ? WHERE key = ?',
+                                 [(accessed_at, key) for key, accessed_at in self._accessed.items()])
+            self._accessed.clear()
+
+    def flush(self) -> None:
+        """Записывает накопленное время обращений, например перед завершением процесса."""
+        with self._lock:
+            self._flush_accessed()
+            self._db.commit()
+
+    def touch(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                             (now, now, key))
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Удаляет давно не использованные записи сверх max_entries."""
+        (count,) = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()
+        if count > self.max_entries:
+            self._db.execute('DELETE FROM responses WHERE key IN ('
+                             'SELECT key FROM responses ORDER BY accessed_at LIMIT ?)',
+                             (count - self.max_entries,))
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._accessed.clear()
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
@@ -1,10 +1,27 @@
 
+import asyncio
 import json
+from typing import Iterable
 
-from src.youtube import YouTubeMixin
+from src import aio
+from src.fields import plan
+from src.lazy import RESOLVER, LazyMixin
+from src.records import ChannelRecord
+from src.youtube import YouTubeMixin, chunked
 
-class Channel(YouTubeMixin):
+class Channel(LazyMixin, YouTubeMixin):
     """Класс для работы с каналом YouTube."""
+    RESOURCE = 'channels'
+    # Поля ответа API, из которых заполняются атрибуты при создании объекта.
+    FIELDS = {'title': 'snippet/title', 'description': 'snippet/description',
+              'subscriberCount': 'statistics/subscriberCount', 'video_count': 'statistics/videoCount',
+              'viewCount': 'statistics/viewCount'}
+    # Поля, которые запрашиваются отдельно при первом обращении к атрибуту.
+    EXTRA_FIELDS = {'published_at': 'snippet/publishedAt', 'custom_url': 'snippet/customUrl',
+                    'uploads_playlist_id': 'contentDetails/relatedPlaylists/uploads'}
+    PARTS, FIELDS_MASK = plan(FIELDS.values())
+    RECORD_PARTS, RECORD_FIELDS_MASK = plan(ChannelRecord.PATHS)
+
     def __init__(self, channel_id: str) -> None:
         """
         Инициализирует экземпляр канала и получает данные о нем из API.
@@ -21,14 +38,147 @@ class Channel(YouTubeMixin):
             viewCount (str): Количество просмотров.
         """
         self.__channel_id = channel_id
-        self.channel_response = self.YOUTUBE.channels().list(id=self.__channel_id, part='snippet,statistics').execute()
+        self.channel_response = self.YOUTUBE.channels().list(id=self.__channel_id, part=self.PARTS,
+                                                             fields=self.FIELDS_MASK).execute()
+        self.url = f"https://www.youtube.com/channel/{self.__channel_id}"
+        self._fill()
+
+    def _fill(self) -> None:
+        """Заполняет атрибуты канала из channel_response."""
+        self._defer_extras()
         self.title = ''.join([x['snippet']['title'] for x in self.channel_response['items']])
         self.description = ''.join([x['snippet']['description'] for x in self.channel_response['items']])
-        self.url = f"https://www.youtube.com/channel/{self.__channel_id}"
         self.subscriberCount = ''.join([x['statistics']['subscriberCount'] for x in self.channel_response['items']])
         self.video_count = ''.join([x['statistics']['videoCount'] for x in self.channel_response['items']])
         self.viewCount = ''.join([x['statistics']['viewCount'] for x in self.channel_response['items']])
 
+    def _resource_id(self) -> str:
+        """Возвращает id канала для дополнительных запросов полей."""
+        return self.__channel_id
+
+    @classmethod
+    def _fetch_items(cls, channel_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Получает данные о каналах пачками по 50 id за один запрос.
+
+        :param channel_ids: Идентификаторы каналов.
+        :return: Словарь {id канала: элемент ответа API}. Ненайденные каналы в словарь не попадают.
+        """
+        found = {}
+        for chunk in chunked(dict.fromkeys(channel_ids)):
+            response = cls.YOUTUBE.channels().list(part=cls.PARTS, id=','.join(chunk),
+                                                   fields=cls.FIELDS_MASK).execute()
+            for item in response.get('items', []):
+                found[item['id']] = item
+        return found
+
+    @classmethod
+    def _new(cls, channel_id: str) -> 'Channel':
+        """Создает объект канала без обращения к API."""
+        channel = cls.__new__(cls)
+        channel.__channel_id = channel_id
+        channel.url = f"https://www.youtube.com/channel/{channel_id}"
+        return channel
+
+    def _load(self, channel_data: dict | None) -> None:
+        """Сохраняет элемент ответа API как ответ по этому каналу и заполняет атрибуты."""
+        self.channel_response = {'items': [channel_data] if channel_data is not None else []}
+        self._fill()
+
+    @classmethod
+    def _load_many(cls, channels: list['Channel']) -> None:
+        """Загружает данные для списка отложенных каналов одним запросом на каждые 50 id."""
+        found = cls._fetch_items(channel.channel_id for channel in channels)
+        for channel in channels:
+            channel._load(found.get(channel.channel_id))
+
+    @classmethod
+    def bulk(cls, channel_ids: Iterable[str]) -> list['Channel']:
+        """
+        Создает несколько объектов каналов, запрашивая данные пачками по 50 id.
+
+        :param channel_ids: Идентификаторы каналов.
+        :return: Список каналов в порядке переданных id.
+        """
+        channels = [cls._new(channel_id) for channel_id in channel_ids]
+        cls._load_many(channels)
+        return channels
+
+    @classmethod
+    async def afetch(cls, channel_id: str) -> 'Channel':
+        """
+        Асинхронно создает канал, получая данные через общий асинхронный клиент.
+
+        :param channel_id: Уникальный идентификатор канала YouTube
+        """
+        channel = cls._new(channel_id)
+        channel.channel_response = await aio.get_client().list('channels', part=cls.PARTS, id=channel_id,
+                                                                    fields=cls.FIELDS_MASK)
+        channel.channel_response.setdefault('items', [])
+        channel._fill()
+        return channel
+
+    @classmethod
+    async def afetch_many(cls, channel_ids: Iterable[str]) -> list['Channel']:
+        """
+        Асинхронно создает несколько каналов, запрашивая пачки по 50 id параллельно.
+
+        :param channel_ids: Идентификаторы каналов.
+        :return: Список каналов в порядке переданных id.
+        """
+        channels = [cls._new(channel_id) for channel_id in channel_ids]
+        client = aio.get_client()
+        responses = await asyncio.gather(*(client.list('channels', part=cls.PARTS, id=','.join(chunk),
+                                                       fields=cls.FIELDS_MASK)
+                                           for chunk in chunked(dict.fromkeys(c.channel_id for c in channels))))
+        found = {item['id']: item for response in responses for item in response.get('items', [])}
+        for channel in channels:
+            channel._load(found.get(channel.channel_id))
+        return channels
+
+    @classmethod
+    def records(cls, channel_ids: Iterable[str], keep_raw: bool = False) -> list[ChannelRecord]:
+        """
+        Загружает каналы пачками по 50 id в компактном виде.
+
+        В памяти одновременно хранится не более одного ответа API. Ненайденные каналы пропускаются.
+
+        :param channel_ids: Идентификаторы каналов.
+        :param keep_raw: Сохранить исходные элементы ответа в атрибуте `raw` записей.
+        :return: Список записей в порядке переданных id.
+        """
+        records = []
+        for chunk in chunked(dict.fromkeys(channel_ids)):
+            response = cls.YOUTUBE.channels().list(part=cls.RECORD_PARTS, id=','.join(chunk),
+                                                   fields=cls.RECORD_FIELDS_MASK).execute()
+            found = {item['id']: item for item in response.get('items', [])}
+            records.extend(ChannelRecord.from_item(found[channel_id], keep_raw)
+                           for channel_id in chunk if channel_id in found)
+        return records
+
+    def to_record(self, keep_raw: bool = False) -> ChannelRecord | None:
+        """
+        Возвращает компактное представление канала или None, если канал не найден.
+
+        :param keep_raw: Сохранить исходный элемент ответа в атрибуте `raw` записи.
+        """
+        items = self.channel_response.get('items', [])
+        return ChannelRecord.from_item(items[0], keep_raw) if items else None
+
+    @classmethod
+    def lazy(cls, channel_id: str) -> 'Channel':
+        """
+        Создает канал без обращения к API.
+
+        Данные загружаются при первом обращении к атрибуту (title, subscriberCount, ...),
+        причем вместе с ним одним запросом загружаются и другие ожидающие каналы.
+
+        :param channel_id: Уникальный идентификатор канала YouTube
+        """
+        channel = cls._new(channel_id)
+        RESOLVER.register(channel, Channel._load_many)
+        return channel
+
     def __repr__(self):
         """
         Возвращает строковое представление объекта для разработчиков.
@@ -46,7 +196,11 @@ class Channel(YouTubeMixin):
         return f"{self.title} ({self.url})"
 
     def print_info(self) -> None:
-        """Выводит в консоль информацию о канале."""
+        """
+        Выводит в консоль информацию о канале.
+
+        Печатается уже полученный channel_response (только поля из FIELDS), без обращения к API.
+        """
         print(json.dumps(self.channel_response, indent=2, ensure_ascii=False))
 
     @property
@@ -70,23 +224,27 @@ class Channel(YouTubeMixin):
         """Возвращает объект службы API YouTube."""
         return cls.YOUTUBE
 
+    def to_dict(self) -> dict:
+        """Возвращает данные о канале в виде словаря."""
+        return {"id": self.__channel_id,
+                "title": self.title,
+                "description": self.description,
+                "url": self.url,
+                "subscriberCount": self.subscriberCount,
+                "videoCount": self.video_count,
+                "viewCount": self.viewCount,
+                }
+
     def to_json(self, path: str) -> None:
         """
         Сохраняет данные о канале в json-файл.
 
+        Для выгрузки большого количества каналов используйте src.export.export.
+
         :param path: Путь к файлу, куда сохранять данные.
         """
-        data = {"id": self.__channel_id,
-                 "title": self.title,
-                 "description": self.description,
-                 "url": self.url,
-                 "subscriberCount": self.subscriberCount,
-                 "videoCount": self.video_count,
-                 "viewCount": self.viewCount,
-                 }
-
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
 
     def __add__(self, other) -> int:
         """Возвращает сумму подписчиков двух каналов."""
@@ -0,0 +1,239 @@
+"""
+Массовый сбор статистики видео по списку каналов.
+
+Запуск:
+    python -m src.crawl channels.txt -o videos.ndjson --workers 8
+
+Для каждого канала определяется плейлист загрузок, перебираются все его элементы и пачками
+по 50 id запрашиваются статистика и длительность видео. Каналы обрабатываются в пуле процессов,
+каждый из которых создает собственный клиент API. Завершенные каналы записываются в файл
+контрольных точек, поэтому после перезапуска они пропускаются. Каналы, которые не удалось
+обработать, записываются с текстом ошибки в файл <output>.failed и повторяются при следующем запуске.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.durations import parse_duration
+from src.fields import plan
+from src.frame import VideoFrame
+from src.playlist import PlayList
+from src.retry import AdaptiveRateLimiter
+from src.youtube import YouTubeMixin, chunked
+
+
+UPLOADS_PARTS, UPLOADS_FIELDS_MASK = plan(['contentDetails/relatedPlaylists/uploads'])
+
+
+def _init_worker(rate: float | None) -> None:
+    """
+    Настраивает ограничение частоты запросов в процессе-обработчике.
+
+    Предел задается ограничителю слоя повторов клиента, поэтому он действует на каждый
+    запрос к API и не может быть превышен при ускорении после успешных ответов.
+    """
+    if rate:
+        YouTubeMixin.YOUTUBE.executor.limiter = AdaptiveRateLimiter(rate=rate, max_rate=rate)
+
+
+def video_row(channel_id: str, playlist_id: str, item: dict) -> dict:
+    """Преобразует элемент ответа videos().list в строку результата."""
+    statistics = item.get('statistics', {})
+    return {
+        'channel_id': channel_id,
+        'playlist_id': playlist_id,
+        'video_id': item['id'],
+        'title': item['snippet']['title'],
+        'published_at': item['snippet']['publishedAt'],
+        'duration': parse_duration(item['contentDetails']['duration']),
+        'view_count': int(statistics.get('viewCount', 0)),
+        'like_count': int(statistics.get('likeCount', 0)),
+        'comment_count': int(statistics.get('commentCount', 0)),
+    }
+
+
+def crawl_channel(channel_id: str, playlist_id: str) -> list[dict]:
+    """
+    Собирает статистику всех видео плейлиста загрузок канала.
+
+    :param channel_id: Уникальный идентификатор канала YouTube
+    :param playlist_id: id плейлиста загрузок канала
+    :return: Строки результата по одной на видео.
+    """
+    rows = []
+    video_ids = []
+    playlist = PlayList.lazy(playlist_id)
+    for page in playlist.iter_pages():
+        video_ids.extend(item['contentDetails']['videoId'] for item in page['items'])
+    for chunk in chunked(video_ids):
+        rows.extend(video_row(channel_id, playlist_id, item) for item in VideoFrame.iter_items(chunk))
+    return rows
+
+
+def uploads_playlists(channel_ids: list[str]) -> dict[str, str]:
+    """
+    Определяет плейлисты загрузок каналов пачками по 50 id.
+
+    :return: Словарь {id канала: id плейлиста загрузок}. Ненайденных каналов в нем нет.
+    """
+    playlists = {}
+    for chunk in chunked(channel_ids):
+        response = YouTubeMixin.YOUTUBE.channels().list(part=UPLOADS_PARTS, id=','.join(chunk),
+                                                        fields=UPLOADS_FIELDS_MASK).execute()
+        for item in response.get('items', []):
+            playlists[item['id']] = item['contentDetails']['relatedPlaylists']['uploads']
+    return playlists
+
+
+def read_ids(path: str) -> list[str]:
+    """Читает идентификаторы по одному в строке, пропуская пустые строки и комментарии '#'."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return list(dict.fromkeys(line.strip() for line in f if line.strip() and not line.startswith('#')))
+
+
+class Writer:
+    """Записывает результаты каналов в NDJSON-файл или в каталог parquet-файлов."""
+    def __init__(self, path: str, output_format: str) -> None:
+        self.path = path
+        self.format = output_format
+        if output_format == 'parquet':
+            import pyarrow.parquet
+
+            self._parquet = pyarrow.parquet
+            os.makedirs(path, exist_ok=True)
+            self._file = None
+        else:
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, channel_id: str, rows: list[dict]) -> None:
+        """Записывает строки одного канала на диск."""
+        if self.format == 'parquet':
+            import pyarrow
+
+            path = os.path.join(self.path, f'{channel_id}.parquet')
+            self._parquet.write_table(pyarrow.Table.from_pylist(rows), path + '.tmp')
+            os.replace(path + '.tmp', path)
+            return
+        self._file.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def reconcile(self, done: set[str]) -> set[str]:
+        """
+        Согласует результаты с файлом контрольных точек после сбоя между записью канала и его отметкой.
+
+        Каналы пишутся по одному, поэтому строки неотмеченного канала в NDJSON-файле могут быть
+        только в конце; они отрезаются вместе с неполной последней строкой, и канал собирается
+        заново без дублей. Файл parquet появляется атомарно (через переименование), поэтому
+        каналы с готовыми файлами считаются завершенными.
+
+        :param done: id каналов из файла контрольных точек.
+        :return: id каналов, полностью записанных, но не отмеченных в файле контрольных точек.
+        """
+        if self.format == 'parquet':
+            return {name[:-len('.parquet')] for name in os.listdir(self.path) if name.endswith('.parquet')} - done
+        keep = size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                size += len(line)
+                try:
+                    if line.endswith(b'\n') and json.loads(line)['channel_id'] in done:
+                        keep = size
+                except (ValueError, KeyError, TypeError):
+                    continue
+        if keep < size:
+            self._file.flush()
+            os.truncate(self.path, keep)
+        return set()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def crawl(channel_ids: list[str], output: str, checkpoint: str, output_format: str = 'ndjson',
+          workers: int = 4, rate: float | None = None, log=sys.stderr, failed: str | None = None) -> int:
+    """
+    Собирает статистику видео каналов, пропуская каналы из файла контрольных точек.
+
+    Ошибка при обработке одного канала не останавливает сбор: канал записывается в файл
+    ошибок и не отмечается в файле контрольных точек, поэтому будет обработан при перезапуске.
+    Каналы, которых нет в API, отмечаются завершенными и записываются в файл ошибок.
+    Перед сбором результаты согласуются с файлом контрольных точек (см. Writer.reconcile).
+
+    :param channel_ids: Идентификаторы каналов.
+    :param output: Путь к NDJSON-файлу или каталогу для parquet.
+    :param checkpoint: Путь к файлу с id завершенных каналов.
+    :param output_format: 'ndjson' или 'parquet'.
+    :param workers: Количество процессов-обработчиков.
+    :param rate: Общий предел запросов в секунду (делится между процессами) или None.
+    :param failed: Путь к файлу ошибок (строки `id канала<TAB>ошибка`), по умолчанию <output>.failed.
+    :return: Количество записанных видео.
+    """
+    done = set(read_ids(checkpoint))
+    writer = Writer(output, output_format)
+    total = 0
+    try:
+        recovered = writer.reconcile(done)
+        pending = [channel_id for channel_id in channel_ids if channel_id not in done and channel_id not in recovered]
+        playlists = uploads_playlists(pending)
+        started = time.monotonic()
+        with open(checkpoint, 'a', encoding='utf-8') as checkpoint_file, \
+                open(failed or output.rstrip('/') + '.failed', 'a', encoding='utf-8') as failed_file, \
+                ProcessPoolExecutor(workers, initializer=_init_worker,
+                                    initargs=(rate / workers if rate else None,)) as pool:
+            checkpoint_file.writelines(channel_id + '\n' for channel_id in sorted(recovered))
+            for channel_id in pending:
+                if channel_id not in playlists:
+                    failed_file.write(f'{channel_id}\tканал не найден\n')
+                    checkpoint_file.write(channel_id + '\n')
+                    print(f'{channel_id}: канал не найден', file=log)
+            failed_file.flush()
+            checkpoint_file.flush()
+            futures = {pool.submit(crawl_channel, channel_id, playlist_id): channel_id
+                       for channel_id, playlist_id in playlists.items()}
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    channel_id = futures.pop(future)
+                    try:
+                        rows = future.result()
+                    except Exception as error:
+                        reason = ' '.join(f'{type(error).__name__}: {error}'.split())
+                        failed_file.write(f'{channel_id}\t{reason}\n')
+                        failed_file.flush()
+                        print(f'{channel_id}: ошибка {reason}', file=log)
+                        continue
+                    writer.write(channel_id, rows)
+                    checkpoint_file.write(channel_id + '\n')
+                    checkpoint_file.flush()
+                    total += len(rows)
+                    print(f'{channel_id}: {len(rows)} видео, всего {total} '
+                          f'({total / (time.monotonic() - started):.0f} видео/с)', file=log)
+    finally:
+        writer.close()
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Точка входа `python -m src.crawl`."""
+    parser = argparse.ArgumentParser(prog='python -m src.crawl', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('channels', help='файл с id каналов, по одному в строке')
+    parser.add_argument('-o', '--output', required=True, help='NDJSON-файл или каталог для parquet')
+    parser.add_argument('-f', '--format', choices=('ndjson', 'parquet'), default='ndjson')
+    parser.add_argument('--checkpoint', help='файл контрольных точек (по умолчанию <output>.done)')
+    parser.add_argument('--failed', help='файл ошибок (по умолчанию <output>.failed)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--rate', type=float, help='предел запросов в секунду для всех процессов')
+    args = parser.parse_args(argv)
+    crawl(read_ids(args.channels), args.output, args.checkpoint or args.output.rstrip('/') + '.done',
+          args.format, args.workers, args.rate, failed=args.failed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from src.cache import process_connection
+from src.fields import plan
+from src.youtube import YouTubeMixin, chunked
+
+# Единицы в порядке, в котором они обязаны идти в длительности.
+_DATE_UNITS = {'D': 86400}
+_TIME_UNITS = {'H': 3600, 'M': 60, 'S': 1}
+
+def _parse_with_isodate(value: str) -> int:
+    """Разбирает произвольную длительность ISO 8601 с помощью isodate."""
+    import isodate
+
+    duration = isodate.parse_duration(value)
+    if isinstance(duration, isodate.Duration):
+        duration = duration.totimedelta(start=datetime.datetime(2000, 1, 1))
+    return int(duration.total_seconds())
+
+
+def parse_duration(value: str) -> int:
+    """
+    Возвращает длительность ISO 8601 в секундах.
+
+    YouTube возвращает длительности только в виде `PT#H#M#S` и `P#DT#H#M#S` (а также `P0D`),
+    их разбирает однопроходный цикл без регулярных выражений и промежуточных объектов.
+    Цикл принимает только строки, в которых есть хотя бы одна единица (и после `T` тоже),
+    а единицы идут по убыванию. Остальные формы (недели, месяцы, дробные секунды) и
+    некорректные строки передаются в isodate.
+
+    :param value: Длительность, например 'PT1H2M3S'.
+    :return: Количество секунд.
+    """
+    if value[:1] != 'P':
+        return _parse_with_isodate(value)
+    units = _DATE_UNITS
+    allowed = ''.join(_DATE_UNITS)
+    total = number = components = 0
+    has_digits = False
+    for char in value[1:]:
+        if '0' <= char <= '9':
+            number = number * 10 + ord(char) - 48
+            has_digits = True
+        elif char == 'T' and units is _DATE_UNITS and not has_digits:
+            units = _TIME_UNITS
+            allowed = ''.join(_TIME_UNITS)
+            components = 0
+        elif has_digits and char in allowed:
+            total += number * units[char]
+            allowed = allowed[allowed.index(char) + 1:]
+            components += 1
+            number = 0
+            has_digits = False
+        else:
+            return _parse_with_isodate(value)
+    if has_digits or not components:
+        return _parse_with_isodate(value)
+    return total
+
+
+class DurationIndex(YouTubeMixin):
+    """
+    Общий индекс длительностей видео {id видео: секунды}.
+
+    Длительность видео не меняется, поэтому каждое видео запрашивается и разбирается один раз
+    для всех плейлистов. Если указан путь, индекс сохраняется в файле SQLite между запусками.
+    """
+    PARTS, FIELDS_MASK = plan(['contentDetails/duration'])
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        :param path: Путь к файлу SQLite или None для индекса только в памяти.
+        """
+        self.path = path
+        self._seconds: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        if path:
+            self._db.execute('CREATE TABLE IF NOT EXISTS durations ('
+                             'video_id TEXT PRIMARY KEY, seconds INTEGER NOT NULL)')
+            self._db.commit()
+
+    @property
+    def _db(self) -> sqlite3.Connection | None:
+        """Возвращает соединение с файлом индекса для текущего процесса или None для индекса в памяти."""
+        if not self.path:
+            return None
+        return process_connection(self, lambda: sqlite3.connect(self.path, check_same_thread=False))
+
+    def _lookup(self, video_ids: list[str]) -> dict[str, int]:
+        """Возвращает уже известные длительности из памяти и файла."""
+        with self._lock:
+            known = {video_id: self._seconds[video_id] for video_id in video_ids if video_id in self._seconds}
+            missing = [video_id for video_id in video_ids if video_id not in known]
+            if missing and self.path:
+                placeholders = ','.join('?' * len(missing))
+                rows = self._db.execute(f'SELECT video_id, seconds FROM durations '
+                                                f'WHERE video_id IN ({placeholders})', missing).fetchall()
+                self._seconds.update(rows)
+                known.update(rows)
+        return known
+
+    def _store(self, durations: dict[str, int]) -> None:
+        """Сохраняет новые длительности в памяти и файле."""
+        with self._lock:
+            self._seconds.update(durations)
+            if self.path and durations:
+                self._db.executemany('INSERT OR REPLACE INTO durations VALUES (?, ?)', durations.items())
+                self._db.commit()
+
+    def iter_seconds(self, video_ids: Iterable[str]) -> Iterator[tuple[str, int]]:
+        """
+        Перебирает длительности видео, запрашивая неизвестные пачками по 50 id.
+
+        Ненайденные видео пропускаются.
+
+        :param video_ids: Идентификаторы видео.
+        :return: Итератор по парам (id видео, секунды) в порядке переданных id.
+        """
+        for chunk in chunked(video_ids):
+            known = self._lookup(chunk)
+            missing = [video_id for video_id in dict.fromkeys(chunk) if video_id not in known]
+            if missing:
+                video_response = self.YOUTUBE.videos().list(part=self.PARTS, id=','.join(missing),
+                                                            fields=self.FIELDS_MASK).execute()
+                fetched = {video['id']: parse_duration(video['contentDetails']['duration'])
+                           for video in video_response.get('items', [])}
+                self._store(fetched)
+                known.update(fetched)
+            for video_id in chunk:
+                if video_id in known:
+                    yield video_id, known[video_id]
+
+    def clear(self) -> None:
+        """Удаляет все длительности из памяти и файла."""
+        with self._lock:
+            self._seconds.clear()
+            if self.path:
+                self._db.execute('DELETE FROM durations')
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._seconds)
+
+
+DURATIONS = DurationIndex(os.getenv('YOUTUBE_DURATION_INDEX'))
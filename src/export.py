@@ -0,0 +1,169 @@
+import csv
+import gzip
+import io
+import itertools
+import json
+import time
+from typing import Callable, Iterable, Iterator
+
+from src.youtube import MAX_RESULTS, chunked
+
+FORMATS = ('ndjson', 'csv', 'parquet')
+BUFFER_SIZE = 1 << 20
+
+
+class ExportReport:
+    """Итог выгрузки."""
+    def __init__(self, path: str, records: int, seconds: float) -> None:
+        """
+        :param path: Путь к файлу.
+        :param records: Количество записанных записей.
+        :param seconds: Время выгрузки в секундах.
+        """
+        self.path = path
+        self.records = records
+        self.seconds = seconds
+
+    @property
+    def records_per_second(self) -> float:
+        """Возвращает скорость выгрузки в записях в секунду."""
+        return self.records / self.seconds if self.seconds else float('inf')
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}({self.path}, records={self.records}, "
+                f"{self.records_per_second:.0f} записей/с)")
+
+
+def _open(path: str, compression: str | None, buffer_size: int):
+    """Открывает файл для записи байтов с буферизацией и, при необходимости, сжатием."""
+    if compression is None:
+        return open(path, 'wb', buffering=buffer_size)
+    if compression == 'gzip':
+        return io.BufferedWriter(gzip.open(path, 'wb', compresslevel=6), buffer_size)
+    if compression == 'zstd':
+        try:
+            from compression import zstd
+
+            return io.BufferedWriter(zstd.open(path, 'wb'), buffer_size)
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError('Для сжатия zstd необходимо установить zstandard: pip install zstandard') from error
+        return io.BufferedWriter(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')), buffer_size)
+    raise ValueError(f"Неизвестный способ сжатия '{compression}', допустимые: gzip, zstd")
+
+
+def _json_encoder(encoder: str | None) -> Callable[[dict], bytes]:
+    """Возвращает функцию, кодирующую запись в строку JSON (bytes) без перевода строки."""
+    if encoder == 'orjson':
+        try:
+            import orjson
+        except ImportError as error:
+            raise ImportError('Для encoder="orjson" необходимо установить orjson: pip install orjson') from error
+        return orjson.dumps
+    if encoder is not None:
+        raise ValueError(f"Неизвестный кодировщик JSON '{encoder}', допустимые: orjson")
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    return lambda record: dumps(record).encode('utf-8')
+
+
+def iter_records(entities: Iterable) -> Iterator[dict]:
+    """
+    Лениво преобразует объекты проекта (Channel, Video, PLVideo, PlayList, записи) и словари в словари.
+
+    Объекты берутся из источника пачками по 50, чтобы отложенные объекты из lazy() одной пачки
+    загружались одним запросом, а не по одному.
+    """
+    for chunk in chunked(entities, MAX_RESULTS):
+        for entity in chunk:
+            yield entity if isinstance(entity, dict) else entity.to_dict()
+
+
+def _write_ndjson(records: Iterator[dict], f, encoder: str | None) -> int:
+    encode = _json_encoder(encoder)
+    count = 0
+    for record in records:
+        f.write(encode(record))
+        f.write(b'\n')
+        count += 1
+    return count
+
+
+def _write_csv(records: Iterator[dict], f) -> int:
+    first = next(records, None)
+    if first is None:
+        return 0
+    text = io.TextIOWrapper(f, encoding='utf-8', newline='', write_through=True)
+    writer = csv.DictWriter(text, fieldnames=list(first), extrasaction='ignore')
+    writer.writeheader()
+    writer.writerow(first)
+    count = 1
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    text.detach()
+    return count
+
+
+def _write_parquet(records: Iterator[dict], path: str, compression: str | None, batch_size: int) -> int:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError('Для format="parquet" необходимо установить pyarrow: pip install pyarrow') from error
+    writer = None
+    count = 0
+    try:
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                break
+            if writer is None:
+                table = pyarrow.Table.from_pylist(batch)
+                # Столбец, пустой во всей первой группе (например, атрибуты ненайденных видео), получил бы тип null,
+                # и следующие группы не удалось бы записать. Такие столбцы записываются как строки.
+                schema = pyarrow.schema([field.with_type(pyarrow.string()) if pyarrow.types.is_null(field.type)
+                                         else field for field in table.schema])
+                table = table.cast(schema)
+                writer = pyarrow.parquet.ParquetWriter(path, schema, compression=compression or 'snappy')
+            else:
+                table = pyarrow.Table.from_pylist(batch, schema=writer.schema)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def export(entities: Iterable, path: str, format: str = 'ndjson', compression: str | None = None,
+           encoder: str | None = None, buffer_size: int = BUFFER_SIZE, batch_size: int = 10_000) -> ExportReport:
+    """
+    Потоково выгружает объекты в один файл.
+
+    Объекты берутся из итерируемого источника пачками по 50 (подходит генератор или список
+    отложенных объектов из lazy(): каждая пачка загружается одним запросом), поэтому в памяти
+    не накапливаются. Столбцы parquet, пустые во всей первой группе строк, имеют строковый тип.
+
+    :param entities: Объекты Channel, Video, PLVideo, PlayList, ChannelRecord, VideoRecord или словари.
+    :param path: Путь к файлу.
+    :param format: 'ndjson', 'csv' или 'parquet'.
+    :param compression: None, 'gzip' или 'zstd'; для parquet - кодек столбцов (по умолчанию snappy).
+    :param encoder: None для стандартного json или 'orjson' для более быстрого кодировщика (только ndjson).
+    :param buffer_size: Размер буфера записи в байтах.
+    :param batch_size: Количество записей в группе строк parquet.
+    :return: Итог выгрузки с количеством записей и скоростью.
+    :raises ValueError: Если передан неизвестный формат.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Неизвестный формат '{format}', допустимые: {', '.join(FORMATS)}")
+    start = time.perf_counter()
+    records = iter_records(entities)
+    if format == 'parquet':
+        count = _write_parquet(records, path, compression, batch_size)
+    else:
+        with _open(path, compression, buffer_size) as f:
+            count = _write_ndjson(records, f, encoder) if format == 'ndjson' else _write_csv(records, f)
+    return ExportReport(path, count, time.perf_counter() - start)
@@ -0,0 +1,122 @@
+from typing import Iterable
+
+
+def get_path(item: dict, path: str):
+    """
+    Возвращает значение поля элемента ответа по пути вида 'snippet/title' или None, если его нет.
+
+    :param item: Элемент ответа API.
+    :param path: Путь к полю через '/'.
+    """
+    value = item
+    for key in path.split('/'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _tree(paths: Iterable[str]) -> dict:
+    """
+    Строит дерево вложенных полей из путей вида 'items/snippet/title'.
+
+    Лист дерева (None) означает поле целиком; он поглощает более глубокие пути.
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split('/')
+        for key in parents:
+            if node.get(key, {}) is None:
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _render(tree: dict) -> str:
+    """Записывает дерево полей в синтаксисе параметра `fields`."""
+    return ','.join(key + (f'({_render(children)})' if children else '') for key, children in tree.items())
+
+
+def fields_mask(paths: Iterable[str]) -> str:
+    """
+    Возвращает значение параметра `fields` для полных путей ответа.
+
+    Пример: ['items/id', 'items/snippet/title', 'etag'] -> 'items(id,snippet(title)),etag'.
+    """
+    return _render(_tree(sorted(set(paths))))
+
+
+def parse_fields(mask: str) -> set[str]:
+    """
+    Разбирает значение параметра `fields` в набор полных путей (обратно к fields_mask).
+
+    :param mask: Например 'items(id,snippet(title)),etag'.
+    """
+    paths = set()
+    stack = ['']
+    name = ''
+    for char in mask + ',':
+        if char == '(':
+            stack.append(stack[-1] + name + '/')
+            name = ''
+        elif char in ',)':
+            if name:
+                paths.add(stack[-1] + name)
+            name = ''
+            if char == ')':
+                stack.pop()
+        elif not char.isspace():
+            name += char
+    return paths
+
+
+def plan(item_paths: Iterable[str], paged: bool = False) -> tuple[str, str]:
+    """
+    Вычисляет минимальные параметры `part` и `fields` для запроса list.
+
+    :param item_paths: Пути к нужным полям внутри элемента ответа, например 'statistics/viewCount'.
+    :param paged: Запрашивать `nextPageToken` для постраничного перебора.
+    :return: Пара (part, fields). Поля `id` элемента и `etag` ответа запрашиваются всегда.
+    """
+    item_paths = set(item_paths)
+    parts = sorted({path.split('/', 1)[0] for path in item_paths} - {'id', 'etag', 'kind'})
+    paths = {'etag', 'items/id', *(f'items/{path}' for path in item_paths)}
+    if paged:
+        paths.add('nextPageToken')
+    return ','.join(parts), fields_mask(paths)
+
+
+def merge_masks(params: Iterable[dict]) -> tuple[str, str | None]:
+    """
+    Объединяет `part` и `fields` нескольких запросов к одному ресурсу.
+
+    :param params: Параметры запросов.
+    :return: Пара (part, fields); fields равно None, если хотя бы один запрос не ограничивал поля.
+    """
+    parts, paths = set(), set()
+    unrestricted = False
+    for request_params in params:
+        parts.update(part for part in str(request_params.get('part', '')).split(',') if part)
+        if request_params.get('fields'):
+            paths |= parse_fields(request_params['fields'])
+        else:
+            unrestricted = True
+    return ','.join(sorted(parts)), None if unrestricted else fields_mask(paths)
+
+
+def apply_fields(response: dict, mask: str) -> dict:
+    """Оставляет в ответе только поля из `fields`, как это делает API."""
+    return _select(response, _tree(parse_fields(mask)))
+
+
+def _select(value, tree: dict):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_select(element, tree) for element in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _select(value[key], children) for key, children in tree.items() if key in value}
@@ -0,0 +1,169 @@
+import datetime
+from array import array
+from typing import Iterable
+
+from src.durations import parse_duration
+from src.fields import plan
+from src.youtube import YouTubeMixin, chunked
+
+NUMERIC_COLUMNS = ('duration', 'view_count', 'like_count', 'comment_count')
+
+
+def _numpy():
+    """Импортирует NumPy, который нужен только для аналитических таблиц."""
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError('Для VideoFrame необходимо установить numpy: pip install numpy') from error
+    return numpy
+
+
+class VideoFrame(YouTubeMixin):
+    """
+    Колоночная таблица статистики видео на массивах NumPy.
+
+    Attributes:
+        video_id, title, channel_id (numpy.ndarray): Строковые столбцы (dtype=object).
+        duration (numpy.ndarray): Длительность в секундах (int64).
+        view_count, like_count, comment_count (numpy.ndarray): Счетчики (int64).
+        published_at (numpy.ndarray): Дата публикации (datetime64[s]).
+    """
+    PATHS = ('snippet/title', 'snippet/channelId', 'snippet/publishedAt', 'contentDetails/duration',
+             'statistics/viewCount', 'statistics/likeCount', 'statistics/commentCount')
+    PARTS, FIELDS_MASK = plan(PATHS)
+
+    def __init__(self, video_id, title, channel_id, duration, view_count, like_count, comment_count,
+                 published_at) -> None:
+        """Создает таблицу из столбцов одинаковой длины (последовательностей или массивов NumPy)."""
+        np = _numpy()
+        self.video_id = np.asarray(video_id, dtype=object)
+        self.title = np.asarray(title, dtype=object)
+        self.channel_id = np.asarray(channel_id, dtype=object)
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.view_count = np.asarray(view_count, dtype=np.int64)
+        self.like_count = np.asarray(like_count, dtype=np.int64)
+        self.comment_count = np.asarray(comment_count, dtype=np.int64)
+        self.published_at = np.asarray(published_at, dtype='datetime64[s]')
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> 'VideoFrame':
+        """
+        Создает таблицу из элементов ответа videos().list с частями snippet, statistics и contentDetails.
+
+        Числовые столбцы накапливаются в array.array, без промежуточных списков объектов int.
+
+        :param items: Элементы `items` ответов API.
+        """
+        np = _numpy()
+        video_id, title, channel_id, published_at = [], [], [], []
+        numeric = {column: array('q') for column in NUMERIC_COLUMNS}
+        for item in items:
+            snippet = item['snippet']
+            statistics = item.get('statistics', {})
+            video_id.append(item['id'])
+            title.append(snippet['title'])
+            channel_id.append(snippet['channelId'])
+            published_at.append(snippet['publishedAt'].rstrip('Z'))
+            numeric['duration'].append(parse_duration(item['contentDetails']['duration']))
+            numeric['view_count'].append(int(statistics.get('viewCount', 0)))
+            numeric['like_count'].append(int(statistics.get('likeCount', 0)))
+            numeric['comment_count'].append(int(statistics.get('commentCount', 0)))
+        columns = {column: np.frombuffer(values, dtype=np.int64) if values else np.empty(0, dtype=np.int64)
+                   for column, values in numeric.items()}
+        return cls(video_id, title, channel_id, published_at=published_at, **columns)
+
+    @classmethod
+    def iter_items(cls, video_ids: Iterable[str]) -> Iterable[dict]:
+        """Запрашивает видео пачками по 50 id и перебирает элементы ответов."""
+        for chunk in chunked(dict.fromkeys(video_ids)):
+            response = cls.YOUTUBE.videos().list(part=cls.PARTS, id=','.join(chunk),
+                                                 fields=cls.FIELDS_MASK).execute()
+            yield from response.get('items', [])
+
+    @classmethod
+    def from_ids(cls, video_ids: Iterable[str]) -> 'VideoFrame':
+        """
+        Загружает видео пачками по 50 id в таблицу. Ненайденные видео пропускаются.
+
+        :param video_ids: Идентификаторы видео.
+        """
+        return cls.from_items(cls.iter_items(video_ids))
+
+    def __len__(self) -> int:
+        return len(self.video_id)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} видео)"
+
+    def _column(self, metric: str):
+        """Возвращает числовой столбец по имени."""
+        if metric not in NUMERIC_COLUMNS:
+            raise ValueError(f"Неизвестный показатель '{metric}', допустимые: {', '.join(NUMERIC_COLUMNS)}")
+        return getattr(self, metric)
+
+    def take(self, indices) -> 'VideoFrame':
+        """Возвращает таблицу из строк с указанными индексами."""
+        return VideoFrame(self.video_id[indices], self.title[indices], self.channel_id[indices],
+                          self.duration[indices], self.view_count[indices], self.like_count[indices],
+                          self.comment_count[indices], self.published_at[indices])
+
+    def total_duration(self) -> datetime.timedelta:
+        """Возвращает суммарную длительность видео."""
+        return datetime.timedelta(seconds=int(self.duration.sum()))
+
+    def mean_duration(self) -> datetime.timedelta:
+        """Возвращает среднюю длительность видео."""
+        if not len(self):
+            return datetime.timedelta()
+        return datetime.timedelta(seconds=float(self.duration.mean()))
+
+    def top(self, k: int = 1, metric: str = 'like_count') -> 'VideoFrame':
+        """
+        Возвращает k видео с наибольшим значением показателя по убыванию.
+
+        :param k: Количество видео.
+        :param metric: 'duration', 'view_count', 'like_count' или 'comment_count'.
+        """
+        np = _numpy()
+        values = self._column(metric)
+        k = min(k, len(values))
+        if k <= 0:
+            return self.take(np.empty(0, dtype=np.intp))
+        candidates = np.argpartition(-values, k - 1)[:k]
+        return self.take(candidates[np.argsort(-values[candidates], kind='stable')])
+
+    def engagement(self):
+        """Возвращает долю (лайки + комментарии) / просмотры для каждого видео, 0 для видео без просмотров."""
+        np = _numpy()
+        views = self.view_count.astype(np.float64)
+        interactions = (self.like_count + self.comment_count).astype(np.float64)
+        return np.divide(interactions, views, out=np.zeros_like(views), where=views > 0)
+
+    def group_by_channel(self, metric: str = 'view_count') -> dict[str, int]:
+        """
+        Суммирует показатель по каналам.
+
+        :param metric: 'duration', 'view_count', 'like_count' или 'comment_count'.
+        :return: Словарь {id канала: сумма}.
+        """
+        np = _numpy()
+        channels, inverse = np.unique(self.channel_id.astype(str), return_inverse=True)
+        sums = np.bincount(inverse, weights=self._column(metric), minlength=len(channels))
+        return {channel: int(total) for channel, total in zip(channels.tolist(), sums)}
+
+    def to_arrow(self):
+        """Возвращает таблицу pyarrow.Table (требуется pyarrow)."""
+        try:
+            import pyarrow
+        except ImportError as error:
+            raise ImportError('Для to_arrow необходимо установить pyarrow: pip install pyarrow') from error
+        return pyarrow.table({
+            'video_id': self.video_id.tolist(),
+            'title': self.title.tolist(),
+            'channel_id': self.channel_id.tolist(),
+            'duration': self.duration,
+            'view_count': self.view_count,
+            'like_count': self.like_count,
+            'comment_count': self.comment_count,
+            'published_at': self.published_at,
+        })
@@ -0,0 +1,154 @@
+import itertools
+import threading
+import weakref
+from typing import Callable
+
+from src.fields import get_path, plan
+from src.youtube import MAX_RESULTS
+
+
+class LazyResolver:
+    """
+    Общий загрузчик отложенных объектов.
+
+    Хранит слабые ссылки на еще не загруженные объекты, сгруппированные по функции загрузки.
+    При обращении к одному из них вместе с ним загружаются и другие ожидающие объекты
+    той же группы, так что одним запросом к API обслуживается до batch_size объектов.
+
+    Блокировка удерживается только на время выбора пачки, загрузка выполняется без нее.
+    Потоки, обратившиеся к объектам уже загружаемой пачки, ждут ее завершения, а остальные
+    потоки загружают свои пачки параллельно.
+    """
+    def __init__(self, batch_size: int = MAX_RESULTS, prefix: str = '_lazy') -> None:
+        """
+        :param batch_size: Максимальное количество объектов, загружаемых за один раз.
+        :param prefix: Префикс атрибутов объекта (`<prefix>_key`, `<prefix>_loader`), в которых
+            хранится состояние очереди. Разные загрузчики одного объекта используют разные префиксы.
+        """
+        self.batch_size = batch_size
+        self._key = prefix + '_key'
+        self._loader = prefix + '_loader'
+        self._batch = prefix + '_batch'
+        self._pending: dict[Callable, weakref.WeakValueDictionary] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def register(self, obj, loader: Callable[[list], None]) -> None:
+        """
+        Ставит объект в очередь на отложенную загрузку.
+
+        :param obj: Незагруженный объект.
+        :param loader: Функция, загружающая список объектов одной группы.
+        """
+        with self._lock:
+            key = next(self._counter)
+            setattr(obj, self._key, key)
+            setattr(obj, self._loader, loader)
+            self._pending.setdefault(loader, weakref.WeakValueDictionary())[key] = obj
+
+    def resolve(self, obj) -> None:
+        """
+        Загружает объект вместе с другими ожидающими объектами его группы.
+
+        :param obj: Объект, к атрибуту которого обратились.
+        """
+        while True:
+            with self._lock:
+                loader = obj.__dict__.get(self._loader)
+                if loader is None:
+                    return
+                loading = obj.__dict__.get(self._batch)
+                if loading is None:
+                    pending = self._pending[loader]
+                    pending.pop(obj.__dict__[self._key], None)
+                    batch = [obj]
+                    for key in list(itertools.islice(pending.keys(), self.batch_size - 1)):
+                        other = pending.pop(key, None)
+                        if other is not None:
+                            batch.append(other)
+                    loading = threading.Event()
+                    for member in batch:
+                        setattr(member, self._batch, loading)
+                    break
+            # Объект загружается в другом потоке: после завершения пачки он либо загружен,
+            # либо (при ошибке) снова доступен для загрузки.
+            loading.wait()
+
+        try:
+            loader(batch)
+        except BaseException:
+            with self._lock:
+                for member in batch:
+                    setattr(member, self._batch, None)
+                for other in batch[1:]:
+                    pending[other.__dict__[self._key]] = other
+            raise
+        else:
+            with self._lock:
+                for loaded in batch:
+                    setattr(loaded, self._loader, None)
+                    setattr(loaded, self._batch, None)
+        finally:
+            loading.set()
+
+    def pending_count(self) -> int:
+        """Возвращает количество ожидающих загрузки объектов."""
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
+
+
+RESOLVER = LazyResolver()
+EXTRAS_RESOLVER = LazyResolver(prefix='_extras')
+
+
+class LazyMixin:
+    """
+    Примесь для отложенной загрузки данных.
+
+    Объект, созданный через `lazy()`, хранит только идентификатор и загружает данные
+    при первом обращении к отсутствующему атрибуту.
+
+    Атрибуты из EXTRA_FIELDS класса не запрашиваются вместе с основными. Загруженные объекты
+    ставятся в очередь EXTRAS_RESOLVER, и при первом обращении к любому из этих атрибутов
+    все они загружаются одним запросом сразу для пачки до 50 объектов.
+
+    LAZY_RESOLVER задает очередь, в которую `lazy()` ставит объекты класса.
+    """
+    EXTRA_FIELDS: dict[str, str] = {}
+    LAZY_RESOLVER = RESOLVER
+
+    def __getattr__(self, name: str):
+        """Загружает отложенный объект или дополнительные поля при обращении к еще не заполненному атрибуту."""
+        if not name.startswith('__'):
+            if self.__dict__.get('_lazy_loader'):
+                self.LAZY_RESOLVER.resolve(self)
+                return getattr(self, name)
+            if name in self.EXTRA_FIELDS:
+                if not self.__dict__.get('_extras_loader'):
+                    self._defer_extras()
+                EXTRAS_RESOLVER.resolve(self)
+                return self.__dict__[name]
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    def _defer_extras(self) -> None:
+        """Ставит объект в очередь на загрузку атрибутов из EXTRA_FIELDS."""
+        if self.EXTRA_FIELDS:
+            EXTRAS_RESOLVER.register(self, type(self)._load_extras)
+
+    @classmethod
+    def _load_extras(cls, objects: list) -> None:
+        """Загружает атрибуты из EXTRA_FIELDS для пачки объектов одним запросом."""
+        part, fields = plan(cls.EXTRA_FIELDS.values())
+        ids = [obj._resource_id() for obj in objects]
+        response = getattr(cls.YOUTUBE, cls.RESOURCE)().list(part=part, id=','.join(dict.fromkeys(ids)),
+                                                              fields=fields).execute()
+        found = {item['id']: item for item in response.get('items', [])}
+        for obj, resource_id in zip(objects, ids):
+            item = found.get(resource_id, {})
+            for name, path in cls.EXTRA_FIELDS.items():
+                setattr(obj, name, get_path(item, path))
+
+    @property
+    def is_loaded(self) -> bool:
+        """Возвращает True, если данные объекта уже получены из API."""
+        return not self.__dict__.get('_lazy_loader')
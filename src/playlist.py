@@ -1,12 +1,29 @@
 
 import datetime
+import heapq
+from functools import cached_property
+from typing import AsyncIterator, Iterator
 
-import isodate
+from src import aio
+from src.durations import DURATIONS
+from src.fields import plan
+from src.frame import VideoFrame
+from src.lazy import LazyMixin, LazyResolver
+from src.youtube import MAX_RESULTS, YouTubeMixin, chunked
 
-from src.youtube import YouTubeMixin
-
-class PlayList(YouTubeMixin):
+class PlayList(LazyMixin, YouTubeMixin):
     """Класс для работы с каналом YouTube."""
+    METRICS = ('likeCount', 'viewCount', 'commentCount')
+    # Поля элементов playlistItems: название плейлиста, id видео, а также позиция, дата и etag для синхронизации.
+    ITEM_PATHS = ('snippet/title', 'snippet/position', 'snippet/publishedAt', 'contentDetails/videoId', 'etag')
+    ITEM_PARTS, ITEM_FIELDS_MASK = plan(ITEM_PATHS, paged=True)
+    STATISTICS_PARTS, STATISTICS_FIELDS_MASK = plan(f'statistics/{metric}' for metric in METRICS)
+    # Индекс длительностей видео, общий для всех плейлистов.
+    DURATIONS = DURATIONS
+    # Плейлисты загружаются по одному запросу на плейлист, поэтому из очереди берется
+    # только тот, к которому обратились.
+    LAZY_RESOLVER = LazyResolver(batch_size=1)
+
     def __init__(self, playlist_id: str) -> None:
         """
         Инициализация объекта PlayList.
@@ -14,18 +31,48 @@ class PlayList(YouTubeMixin):
         :param playlist_id: - идентификатор плейлиста.
 
         Извлеченная информация сохраняется в следующих атрибутах объекта:
-            playlist_response (dict): Ответ от API YouTube с информацией о плейлисте.
+            playlist_response (dict): Первая страница ответа API YouTube с элементами плейлиста.
             playlist_id (str): Идентификатор плейлиста.
-            videos_id (str): Список идентификаторов видео в плейлисте.
+            videos_id (list): Список идентификаторов видео в плейлисте (загружается при первом обращении).
             title (str): Название плейлиста.
             url (str): URL-адрес плейлиста.
         """
         self.playlist_id = playlist_id
-        self.playlist_response = self.YOUTUBE.playlistItems().list(part='snippet,contentDetails',
-                                              playlistId=self.playlist_id).execute()
-        self.videos_id = [play_list["contentDetails"]["videoId"] for play_list in self.playlist_response['items']]
-        self.title = ''.join([title['snippet']['title'] for title in self.playlist_response['items']]).split('.')[0]
         self.url = f'https://www.youtube.com/playlist?list={self.playlist_id}'
+        self._load()
+
+    def _load(self) -> None:
+        """Запрашивает первую страницу элементов плейлиста и заполняет атрибуты."""
+        self.playlist_response = self._fetch_page()
+        self.title = ''.join([title['snippet']['title'] for title in self.playlist_response['items']]).split('.')[0]
+
+    @staticmethod
+    def _load_many(playlists: list['PlayList']) -> None:
+        """Загружает данные для списка отложенных плейлистов (пачка из одного плейлиста, см. LAZY_RESOLVER)."""
+        for playlist in playlists:
+            playlist._load()
+
+    @classmethod
+    def lazy(cls, playlist_id: str) -> 'PlayList':
+        """
+        Создает плейлист без обращения к API.
+
+        Первая страница элементов запрашивается при первом обращении к атрибуту.
+
+        :param playlist_id: - идентификатор плейлиста.
+        """
+        playlist = cls.__new__(cls)
+        playlist.playlist_id = playlist_id
+        playlist.url = f'https://www.youtube.com/playlist?list={playlist_id}'
+        cls.LAZY_RESOLVER.register(playlist, PlayList._load_many)
+        return playlist
+
+    def to_dict(self) -> dict:
+        """Возвращает данные о плейлисте в виде словаря."""
+        return {"id": self.playlist_id,
+                "title": self.title,
+                "url": self.url,
+                }
 
     def __repr__(self):
         """
@@ -35,33 +82,130 @@ class PlayList(YouTubeMixin):
         """
         return f'{self.__class__.__name__}{self.playlist_id}'
 
+    def _fetch_page(self, page_token: str | None = None) -> dict:
+        """
+        Запрашивает одну страницу элементов плейлиста.
+
+        :param page_token: Токен страницы из `nextPageToken` предыдущего ответа.
+        :return: Ответ playlistItems().list.
+        """
+        return self.YOUTUBE.playlistItems().list(part=self.ITEM_PARTS,
+                                                 fields=self.ITEM_FIELDS_MASK,
+                                                 playlistId=self.playlist_id,
+                                                 maxResults=MAX_RESULTS,
+                                                 pageToken=page_token).execute()
+
+    def iter_pages(self) -> Iterator[dict]:
+        """
+        Лениво перебирает страницы элементов плейлиста, следуя по `nextPageToken`.
+
+        :return: Итератор по ответам playlistItems().list, начиная с playlist_response.
+        """
+        page = self.playlist_response
+        while True:
+            yield page
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return
+            page = self._fetch_page(page_token)
+
+    def iter_items(self) -> Iterator[dict]:
+        """
+        Лениво перебирает все элементы плейлиста, следуя по `nextPageToken`.
+
+        В памяти одновременно хранится не более одной страницы (50 элементов).
+
+        :return: Итератор по элементам ответа playlistItems().list.
+        """
+        for page in self.iter_pages():
+            yield from page['items']
+
+    async def aiter_items(self) -> AsyncIterator[dict]:
+        """
+        Асинхронно перебирает все элементы плейлиста через общий асинхронный клиент.
+
+        :return: Асинхронный итератор по элементам ответа playlistItems().list.
+        """
+        async for page in aio.iter_pages('playlistItems', part=self.ITEM_PARTS, fields=self.ITEM_FIELDS_MASK,
+                                         playlistId=self.playlist_id, maxResults=MAX_RESULTS):
+            for item in page['items']:
+                yield item
+
+    def iter_videos_id(self) -> Iterator[str]:
+        """Лениво перебирает идентификаторы всех видео плейлиста."""
+        if 'videos_id' in self.__dict__:
+            yield from self.videos_id
+            return
+        for item in self.iter_items():
+            yield item['contentDetails']['videoId']
+
+    @cached_property
+    def videos_id(self) -> list[str]:
+        """Возвращает список идентификаторов всех видео плейлиста, загружая его при первом обращении."""
+        return list(self.iter_videos_id())
+
     @property
-    def total_duration(self) -> int:
-        """Возвращает общее продолжительность видео в плейлисте."""
-        total_duration = datetime.timedelta()
-        video_response = self.YOUTUBE.videos().list(part='contentDetails',
-                                              id=self.videos_id).execute()
-
-        for video in video_response['items']:
-            iso8601_format = video["contentDetails"]["duration"]
-            durations = isodate.parse_duration(iso8601_format)
-            total_duration += datetime.timedelta(seconds=durations.total_seconds())
-        return total_duration
+    def total_duration(self) -> datetime.timedelta:
+        """
+        Возвращает общее продолжительность видео в плейлисте.
 
-    def show_best_video(self) -> str:
-        """Возвращает ссылку на самое популярное видео в плейлисте."""
-        number_likes = []
-        id = []
+        Результат запоминается до вызова invalidate(), а длительности отдельных видео берутся
+        из общего индекса DURATIONS, так что пересекающиеся плейлисты не запрашивают их повторно.
+        """
+        if self.__dict__.get('_total_duration') is None:
+            seconds = sum(duration for _, duration in self.DURATIONS.iter_seconds(self.iter_videos_id()))
+            self._total_duration = datetime.timedelta(seconds=seconds)
+        return self._total_duration
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает запомненные идентификаторы видео и общую длительность плейлиста.
+
+        Первая страница элементов запрашивается заново, так как iter_pages() начинает перебор с нее
+        и со старым nextPageToken продолжил бы по устаревшему списку.
+        """
+        self.__dict__.pop('videos_id', None)
+        self.__dict__.pop('_total_duration', None)
+        if self.is_loaded:
+            self._load()
+
+    def _fetch_statistics(self) -> dict[str, dict]:
+        """
+        Получает статистику всех видео плейлиста пачками по 50 id за один запрос.
+
+        :return: Словарь {id видео: statistics}.
+        """
+        statistics = {}
+        for chunk in chunked(self.iter_videos_id()):
+            video_response = self.YOUTUBE.videos().list(part=self.STATISTICS_PARTS, id=','.join(chunk),
+                                                        fields=self.STATISTICS_FIELDS_MASK).execute()
+            for video in video_response['items']:
+                statistics[video['id']] = video['statistics']
+        return statistics
+
+    def top_videos(self, k: int = 1, metric: str = 'likeCount') -> list[str]:
+        """
+        Возвращает ссылки на k самых популярных видео плейлиста.
 
-        for video in self.videos_id:
-            video_response = self.YOUTUBE.videos().list(part='statistics',
-                                                        id=video).execute()
+        :param k: Количество видео.
+        :param metric: Показатель популярности: 'likeCount', 'viewCount' или 'commentCount'.
+        :return: Ссылки на видео по убыванию показателя.
+        :raises ValueError: Если передан неизвестный показатель.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Неизвестный показатель '{metric}', допустимые: {', '.join(self.METRICS)}")
+        statistics = self._fetch_statistics()
+        counts = ((int(video_statistics.get(metric, 0)), video_id)
+                  for video_id, video_statistics in statistics.items())
+        best = heapq.nlargest(k, counts, key=lambda count: count[0])
+        return [f'https://youtu.be/{video_id}' for _, video_id in best]
 
-            for items in video_response['items']:
-                likes = items['statistics']['likeCount']
-                number_likes.append(likes)
-                id.append(items['id'])
+    def to_frame(self) -> VideoFrame:
+        """Загружает все видео плейлиста в колоночную таблицу VideoFrame (требуется numpy)."""
+        return VideoFrame.from_ids(self.iter_videos_id())
 
-        for rating in range(len(number_likes)):
-            if number_likes[rating] == max(number_likes):
-                return f'https://youtu.be/{id[rating]}'
+    def show_best_video(self) -> str:
+        """Возвращает ссылку на самое популярное видео в плейлисте."""
+        best = self.top_videos(1)
+        if best:
+            return best[0]
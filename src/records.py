@@ -0,0 +1,137 @@
+class ChannelRecord:
+    """
+    Компактное представление канала YouTube.
+
+    Хранит только нужные поля в __slots__, счетчики преобразуются в int один раз при создании,
+    поэтому сортировка и суммирование не разбирают строки в каждом сравнении.
+    Исходный элемент ответа API сохраняется в `raw`, только если это запрошено.
+    """
+    __slots__ = ('channel_id', 'title', 'description', 'subscriber_count', 'video_count', 'view_count', 'raw')
+    PATHS = ('snippet/title', 'snippet/description', 'statistics/subscriberCount', 'statistics/videoCount',
+             'statistics/viewCount')
+
+    def __init__(self, channel_id: str, title: str, description: str, subscriber_count: int,
+                 video_count: int, view_count: int, raw: dict | None = None) -> None:
+        self.channel_id = channel_id
+        self.title = title
+        self.description = description
+        self.subscriber_count = subscriber_count
+        self.video_count = video_count
+        self.view_count = view_count
+        self.raw = raw
+
+    @classmethod
+    def from_item(cls, item: dict, keep_raw: bool = False) -> 'ChannelRecord':
+        """
+        Создает запись из элемента ответа channels().list.
+
+        :param item: Элемент `items` ответа API с частями snippet и statistics.
+        :param keep_raw: Сохранить исходный элемент ответа в атрибуте `raw`.
+        """
+        snippet = item['snippet']
+        statistics = item['statistics']
+        return cls(item['id'], snippet['title'], snippet['description'],
+                   int(statistics.get('subscriberCount', 0)), int(statistics.get('videoCount', 0)),
+                   int(statistics.get('viewCount', 0)), item if keep_raw else None)
+
+    @property
+    def url(self) -> str:
+        """Возвращает ссылку на канал."""
+        return f"https://www.youtube.com/channel/{self.channel_id}"
+
+    def to_dict(self) -> dict:
+        """Возвращает данные о канале в виде словаря с теми же ключами, что и Channel.to_dict."""
+        return {"id": self.channel_id,
+                "title": self.title,
+                "description": self.description,
+                "url": self.url,
+                "subscriberCount": self.subscriber_count,
+                "videoCount": self.video_count,
+                "viewCount": self.view_count,
+                }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.channel_id}"
+
+    def __str__(self) -> str:
+        return f"{self.title} ({self.url})"
+
+    def __add__(self, other) -> int:
+        """Возвращает сумму подписчиков двух каналов."""
+        return self.subscriber_count + other.subscriber_count
+
+    def __radd__(self, other) -> int:
+        """Позволяет суммировать подписчиков через sum(records)."""
+        return other + self.subscriber_count
+
+    def __sub__(self, other) -> int:
+        """Возвращает разницу подписчиков двух каналов."""
+        return self.subscriber_count - other.subscriber_count
+
+    def __gt__(self, other) -> bool:
+        return self.subscriber_count > other.subscriber_count
+
+    def __ge__(self, other) -> bool:
+        return self.subscriber_count >= other.subscriber_count
+
+    def __lt__(self, other) -> bool:
+        return self.subscriber_count < other.subscriber_count
+
+    def __le__(self, other) -> bool:
+        return self.subscriber_count <= other.subscriber_count
+
+
+class VideoRecord:
+    """
+    Компактное представление видео YouTube.
+
+    Хранит только нужные поля в __slots__, счетчики преобразуются в int один раз при создании.
+    Исходный элемент ответа API сохраняется в `raw`, только если это запрошено.
+    """
+    __slots__ = ('video_id', 'title', 'view_count', 'like_count', 'comment_count', 'raw')
+    PATHS = ('snippet/title', 'statistics/viewCount', 'statistics/likeCount', 'statistics/commentCount')
+
+    def __init__(self, video_id: str, title: str, view_count: int, like_count: int,
+                 comment_count: int, raw: dict | None = None) -> None:
+        self.video_id = video_id
+        self.title = title
+        self.view_count = view_count
+        self.like_count = like_count
+        self.comment_count = comment_count
+        self.raw = raw
+
+    @classmethod
+    def from_item(cls, item: dict, keep_raw: bool = False) -> 'VideoRecord':
+        """
+        Создает запись из элемента ответа videos().list.
+
+        Скрытые счетчики (например, лайки) считаются равными 0.
+
+        :param item: Элемент `items` ответа API с частями snippet и statistics.
+        :param keep_raw: Сохранить исходный элемент ответа в атрибуте `raw`.
+        """
+        statistics = item['statistics']
+        return cls(item['id'], item['snippet']['title'], int(statistics.get('viewCount', 0)),
+                   int(statistics.get('likeCount', 0)), int(statistics.get('commentCount', 0)),
+                   item if keep_raw else None)
+
+    @property
+    def url(self) -> str:
+        """Возвращает ссылку на видео."""
+        return f'https://www.youtube.com/watch?v={self.video_id}'
+
+    def to_dict(self) -> dict:
+        """Возвращает данные о видео в виде словаря с ключами Video.to_dict и количеством комментариев."""
+        return {"id": self.video_id,
+                "title": self.title,
+                "url": self.url,
+                "viewCount": self.view_count,
+                "likeCount": self.like_count,
+                "commentCount": self.comment_count,
+                }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.video_id}"
+
+    def __str__(self):
+        return f"{self.title}"
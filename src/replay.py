@@ -0,0 +1,197 @@
+import gzip
+import json
+import threading
+import urllib.parse
+import zlib
+
+from src.fields import apply_fields
+
+
+def _response(status: int, headers: dict | None = None):
+    """Создает объект ответа httplib2."""
+    import httplib2
+
+    return httplib2.Response({'status': str(status), 'content-type': 'application/json; charset=UTF-8',
+                              **(headers or {})})
+
+
+def request_key(method: str, uri: str) -> str:
+    """
+    Возвращает ключ запроса для кассеты: метод, путь и отсортированные параметры без ключа API.
+
+    :param method: HTTP-метод.
+    :param uri: Адрес запроса.
+    """
+    parts = urllib.parse.urlsplit(uri)
+    query = sorted((key, value) for key, value in urllib.parse.parse_qsl(parts.query) if key != 'key')
+    return f'{method} {parts.path}?{urllib.parse.urlencode(query)}'
+
+
+class RecordingHttp:
+    """
+    HTTP-транспорт, записывающий ответы реального API в кассету (JSON, сжатый gzip).
+
+    Пример:
+        recorder = RecordingHttp('cassettes/playlist.json.gz')
+        YouTubeMixin.set_service(build_service(http=recorder))
+        PlayList('PL...').total_duration
+        recorder.save()
+    """
+    def __init__(self, path: str, http=None) -> None:
+        """
+        :param path: Путь к файлу кассеты.
+        :param http: Транспорт, через который отправляются запросы (по умолчанию httplib2.Http()).
+        """
+        if http is None:
+            import httplib2
+
+            http = httplib2.Http()
+        self.path = path
+        self.http = http
+        self.interactions: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """Отправляет запрос и запоминает ответ."""
+        response, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        with self._lock:
+            self.interactions[request_key(method, uri)] = {
+                'status': response.status,
+                'headers': {key: value for key, value in response.items() if key in ('etag', 'retry-after')},
+                'content': content.decode('utf-8'),
+            }
+        return response, content
+
+    def save(self) -> None:
+        """Сохраняет кассету на диск."""
+        with self._lock, gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump(self.interactions, f, ensure_ascii=False)
+
+
+class ReplayHttp:
+    """HTTP-транспорт, отвечающий из кассеты, записанной RecordingHttp, без обращения к сети."""
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Путь к файлу кассеты.
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.interactions = json.load(f)
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """
+        Возвращает записанный ответ.
+
+        :raises KeyError: Если такого запроса в кассете нет.
+        """
+        key = request_key(method, uri)
+        if key not in self.interactions:
+            raise KeyError(f'Запрос отсутствует в кассете: {key}')
+        interaction = self.interactions[key]
+        return _response(interaction['status'], interaction['headers']), interaction['content'].encode('utf-8')
+
+
+class SyntheticHttp:
+    """
+    HTTP-транспорт, генерирующий правдоподобные ответы API без сети.
+
+    Значения детерминированы и зависят только от id, поэтому результаты воспроизводимы.
+    Плейлист 'PL<имя>' содержит playlist_size видео с id '<имя>-<номер>', плейлист загрузок
+    канала 'UC<имя>' - 'UU<имя>'. Видео с id, начинающимся на 'missing', считаются удаленными.
+
+    Attributes:
+        calls (list): Выполненные запросы: (ресурс, параметры).
+    """
+    def __init__(self, playlist_size: int = 1000) -> None:
+        """
+        :param playlist_size: Количество видео в каждом плейлисте.
+        """
+        self.playlist_size = playlist_size
+        self.calls = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _number(resource_id: str) -> int:
+        return zlib.crc32(resource_id.encode('utf-8'))
+
+    def channel(self, channel_id: str) -> dict:
+        """Возвращает элемент ответа channels().list."""
+        number = self._number(channel_id)
+        return {
+            'kind': 'youtube#channel', 'etag': f'{number:x}', 'id': channel_id,
+            'snippet': {'title': f'Channel {channel_id}', 'description': f'Description of {channel_id}',
+                        'publishedAt': '2012-07-13T09:48:44Z',
+                        'thumbnails': {'default': {'url': f'https://yt3.ggpht.com/{channel_id}', 'width': 88,
+                                                   'height': 88}},
+                        'localized': {'title': f'Channel {channel_id}', 'description': f'Description of {channel_id}'}},
+            'statistics': {'viewCount': str(number % 10_000_000), 'subscriberCount': str(number % 100_000),
+                           'hiddenSubscriberCount': False, 'videoCount': str(self.playlist_size)},
+            'contentDetails': {'relatedPlaylists': {'likes': '', 'uploads': 'UU' + channel_id[2:]}},
+        }
+
+    def video(self, video_id: str) -> dict:
+        """Возвращает элемент ответа videos().list."""
+        number = self._number(video_id)
+        hours, minutes, seconds = number % 3, number % 60, number % 59
+        return {
+            'kind': 'youtube#video', 'etag': f'{number:x}', 'id': video_id,
+            'snippet': {'publishedAt': f'2023-{number % 12 + 1:02d}-{number % 28 + 1:02d}T10:00:00Z',
+                        'channelId': f'UC{number % 50}', 'title': f'Video {video_id}',
+                        'description': f'Description of {video_id}',
+                        'thumbnails': {'default': {'url': f'https://i.ytimg.com/vi/{video_id}/default.jpg',
+                                                   'width': 120, 'height': 90}},
+                        'localized': {'title': f'Video {video_id}', 'description': f'Description of {video_id}'}},
+            'contentDetails': {'duration': f'PT{hours}H{minutes}M{seconds}S' if hours else f'PT{minutes}M{seconds}S',
+                               'dimension': '2d', 'definition': 'hd', 'caption': 'false'},
+            'statistics': {'viewCount': str(number % 1_000_000), 'likeCount': str(number % 10_000),
+                           'favoriteCount': '0', 'commentCount': str(number % 500)},
+        }
+
+    def playlist_item(self, playlist_id: str, position: int) -> dict:
+        """Возвращает элемент ответа playlistItems().list."""
+        video_id = f'{playlist_id[2:]}-{position}'
+        return {
+            'kind': 'youtube#playlistItem', 'etag': f'{playlist_id}-{position}', 'id': f'{playlist_id}.{position}',
+            'snippet': {'publishedAt': '2023-01-01T00:00:00Z', 'title': f'Video {video_id}. Part {position}',
+                        'playlistId': playlist_id, 'position': position,
+                        'resourceId': {'kind': 'youtube#video', 'videoId': video_id}},
+            'contentDetails': {'videoId': video_id, 'videoPublishedAt': '2023-01-01T00:00:00Z'},
+        }
+
+    def list(self, resource: str, params: dict) -> dict:
+        """Возвращает ответ resource.list для параметров запроса с учетом `part` и `fields`."""
+        response = self._list(resource, params)
+        parts = {'id', 'kind', 'etag', *params.get('part', '').split(',')}
+        response['items'] = [{key: value for key, value in item.items() if key in parts}
+                             for item in response['items']]
+        if params.get('fields'):
+            response = apply_fields(response, params['fields'])
+        return response
+
+    def _list(self, resource: str, params: dict) -> dict:
+        response = {'kind': f'youtube#{resource[:-1]}ListResponse', 'etag': 'synthetic'}
+        if resource in ('channels', 'videos'):
+            ids = [resource_id for resource_id in params.get('id', '').split(',')
+                   if resource_id and not resource_id.startswith('missing')]
+            make = self.channel if resource == 'channels' else self.video
+            response['items'] = [make(resource_id) for resource_id in ids]
+            response['pageInfo'] = {'totalResults': len(ids), 'resultsPerPage': len(ids)}
+        elif resource == 'playlistItems':
+            size = int(params.get('maxResults', 5))
+            start = int(params.get('pageToken', 0))
+            stop = min(start + size, self.playlist_size)
+            response['items'] = [self.playlist_item(params['playlistId'], position) for position in range(start, stop)]
+            response['pageInfo'] = {'totalResults': self.playlist_size, 'resultsPerPage': size}
+            if stop < self.playlist_size:
+                response['nextPageToken'] = str(stop)
+        else:
+            response['items'] = []
+        return response
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """Возвращает синтетический ответ на запрос googleapiclient."""
+        parts = urllib.parse.urlsplit(uri)
+        resource = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        params = dict(urllib.parse.parse_qsl(parts.query))
+        with self._lock:
+            self.calls.append((resource, params))
+        return _response(200), json.dumps(self.list(resource, params), ensure_ascii=False).encode('utf-8')
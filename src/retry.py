@@ -0,0 +1,294 @@
+import asyncio
+import datetime
+import json
+import random
+import socket
+import threading
+import time
+from typing import Awaitable, Callable
+
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+THROTTLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+
+
+class QuotaExhaustedError(Exception):
+    """Дневная квота API исчерпана; повторять запросы до ее сброса бессмысленно."""
+
+
+class CircuitOpenError(Exception):
+    """Запрос не отправлен, так как после серии сбоев API временно считается недоступным."""
+
+
+def _error_reasons(error: Exception) -> set[str]:
+    """Возвращает причины ошибки из тела ответа googleapiclient.errors.HttpError."""
+    try:
+        content = json.loads(error.content)
+        return {detail.get('reason') for detail in content['error'].get('errors', [])}
+    except (AttributeError, TypeError, ValueError, KeyError):
+        return set()
+
+
+def _network_errors() -> tuple[type[Exception], ...]:
+    """
+    Возвращает типы временных сетевых ошибок.
+
+    Это не все OSError: отсутствующий файл или ошибка проверки SSL-сертификата не исчезнут
+    при повторе. Ошибка DNS в httplib2 (ServerNotFoundError) не является OSError и добавляется отдельно.
+    """
+    errors = (ConnectionError, TimeoutError, socket.timeout)
+    try:
+        import httplib2
+    except ImportError:
+        return errors
+    return errors + (httplib2.ServerNotFoundError,)
+
+
+def classify(error: Exception) -> str | None:
+    """
+    Определяет тип ошибки запроса.
+
+    :return: 'quota' - дневная квота исчерпана, 'throttle' - нужно снизить частоту запросов,
+        'transient' - временный сбой сервера или сети, None - ошибку повторять не нужно.
+    """
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        return 'transient' if isinstance(error, _network_errors()) else None
+    reasons = _error_reasons(error)
+    if status == 403 and reasons & QUOTA_REASONS:
+        return 'quota'
+    if status == 429 or (status == 403 and reasons & THROTTLE_REASONS):
+        return 'throttle'
+    if status in TRANSIENT_STATUSES:
+        return 'transient'
+    return None
+
+
+def next_quota_reset(now: datetime.datetime | None = None) -> float:
+    """Возвращает время (unix) ближайшего сброса квоты: полночь по тихоокеанскому времени."""
+    try:
+        from zoneinfo import ZoneInfo
+
+        zone = ZoneInfo('America/Los_Angeles')
+    except (ImportError, KeyError):
+        zone = datetime.timezone(datetime.timedelta(hours=-8))
+    now = (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(zone)
+    midnight = (now + datetime.timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+
+class AdaptiveRateLimiter:
+    """
+    Ограничитель частоты запросов (token bucket), подстраивающийся под ответы API.
+
+    При ответе «слишком много запросов» частота уменьшается вдвое, после каждого успешного
+    запроса понемногу увеличивается (AIMD). Пока API ни разу не ограничивал частоту и rate
+    не задан, запросы не задерживаются.
+    """
+    def __init__(self, rate: float | None = None, burst: int = 10, min_rate: float = 0.5,
+                 max_rate: float | None = None, throttle_rate: float = 10.0, increase: float = 0.1) -> None:
+        """
+        :param rate: Начальное количество запросов в секунду или None без ограничения.
+        :param burst: Емкость корзины (сколько запросов можно отправить подряд).
+        :param min_rate: Нижняя граница частоты.
+        :param max_rate: Верхняя граница частоты или None.
+        :param throttle_rate: Частота после первого ограничения, если rate не был задан.
+        :param increase: Прирост частоты после успешного запроса.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.throttle_rate = throttle_rate
+        self.increase = increase
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Забирает токен и возвращает 0 или возвращает, сколько секунд ждать до появления токена."""
+        with self._lock:
+            if self.rate is None:
+                return 0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Дожидается токена на отправку запроса."""
+        while delay := self._take():
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Асинхронно дожидается токена на отправку запроса, не блокируя цикл событий."""
+        while delay := self._take():
+            await asyncio.sleep(delay)
+
+    def on_success(self) -> None:
+        """Понемногу увеличивает частоту после успешного запроса."""
+        with self._lock:
+            if self.rate is not None:
+                self.rate += self.increase
+                if self.max_rate is not None:
+                    self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self) -> None:
+        """Уменьшает частоту вдвое после ответа «слишком много запросов»."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2 if self.rate is not None else self.throttle_rate)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель: после failure_threshold сбоев подряд запросы не отправляются reset_timeout секунд,
+    затем пропускается один пробный запрос.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        :param failure_threshold: Количество сбоев подряд, после которого предохранитель срабатывает.
+        :param reset_timeout: Через сколько секунд разрешить пробный запрос.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Проверяет, можно ли отправить запрос.
+
+        :raises CircuitOpenError: Если предохранитель сработал и время ожидания не истекло.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f'API недоступен после {self.failures} сбоев подряд, '
+                                       f'повторная попытка через {remaining:.0f} с')
+            self.opened_at = time.monotonic()  # пропускаем один пробный запрос
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class ResilientExecutor:
+    """
+    Выполняет запросы с повторами, ограничением частоты и предохранителем.
+
+    Временные сбои (500/502/503/504, ошибки сети) и ограничения частоты (429, 403 rateLimitExceeded)
+    повторяются с экспоненциальной задержкой и случайным разбросом (full jitter); ограничения частоты
+    дополнительно снижают скорость AdaptiveRateLimiter. Исчерпанная дневная квота (403 quotaExceeded)
+    не повторяется: до полуночи по тихоокеанскому времени запросы сразу завершаются QuotaExhaustedError.
+    """
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 32.0,
+                 limiter: AdaptiveRateLimiter | None = None, breaker: CircuitBreaker | None = None) -> None:
+        """
+        :param max_attempts: Максимальное количество попыток.
+        :param base_delay: Задержка перед первой повторной попыткой в секундах.
+        :param max_delay: Максимальная задержка между попытками в секундах.
+        :param limiter: Ограничитель частоты (по умолчанию AdaptiveRateLimiter без начального предела).
+        :param breaker: Предохранитель (по умолчанию CircuitBreaker()).
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter if limiter is not None else AdaptiveRateLimiter()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.quota_exhausted_until = None
+        self.sleep = time.sleep
+        self.async_sleep = asyncio.sleep
+
+    def _delay(self, attempt: int, error: Exception) -> float:
+        """Возвращает задержку перед повтором: Retry-After, если он указан, иначе full jitter."""
+        retry_after = getattr(getattr(error, 'resp', None), 'get', lambda key: None)('retry-after')
+        if retry_after and str(retry_after).isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _check_quota(self) -> None:
+        """Завершает запрос QuotaExhaustedError, если квота исчерпана и еще не сброшена."""
+        if self.quota_exhausted_until is not None:
+            if time.time() < self.quota_exhausted_until:
+                raise QuotaExhaustedError('Дневная квота API исчерпана')
+            self.quota_exhausted_until = None
+
+    def _on_error(self, attempt: int, error: Exception) -> float:
+        """
+        Обрабатывает ошибку попытки.
+
+        :return: Задержка перед следующей попыткой в секундах.
+        :raises: Исходную ошибку, если ее не нужно повторять или попытки закончились, и
+            QuotaExhaustedError, если исчерпана квота.
+        """
+        kind = classify(error)
+        if kind == 'quota':
+            self.quota_exhausted_until = next_quota_reset()
+            raise QuotaExhaustedError('Дневная квота API исчерпана') from error
+        if kind is None:
+            raise error
+        if kind == 'throttle':
+            self.limiter.on_throttle()
+        else:
+            self.breaker.on_failure()
+        if attempt == self.max_attempts - 1:
+            raise error
+        return self._delay(attempt, error)
+
+    def _on_success(self) -> None:
+        self.limiter.on_success()
+        self.breaker.on_success()
+
+    def call(self, send: Callable[[], dict]) -> dict:
+        """
+        Выполняет send с повторами.
+
+        :param send: Функция, отправляющая запрос и возвращающая ответ.
+        :raises QuotaExhaustedError: Если дневная квота исчерпана.
+        :raises CircuitOpenError: Если предохранитель сработал.
+        """
+        self._check_quota()
+        for attempt in range(self.max_attempts):
+            self.breaker.before_call()
+            self.limiter.acquire()
+            try:
+                response = send()
+            except Exception as error:
+                self.sleep(self._on_error(attempt, error))
+            else:
+                self._on_success()
+                return response
+
+    async def acall(self, send: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Асинхронно выполняет send с теми же повторами, ограничением частоты и предохранителем, что и call.
+
+        :param send: Функция, возвращающая корутину запроса.
+        :raises QuotaExhaustedError: Если дневная квота исчерпана.
+        :raises CircuitOpenError: Если предохранитель сработал.
+        """
+        self._check_quota()
+        for attempt in range(self.max_attempts):
+            self.breaker.before_call()
+            await self.limiter.aacquire()
+            try:
+                response = await send()
+            except Exception as error:
+                await self.async_sleep(self._on_error(attempt, error))
+            else:
+                self._on_success()
+                return response
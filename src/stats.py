@@ -0,0 +1,185 @@
+import bisect
+import json
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+# Стоимость запросов в единицах квоты YouTube Data API v3.
+# Все методы list, кроме search.list, стоят 1 единицу.
+QUOTA_COSTS = {
+    ('search', 'list'): 100,
+}
+DEFAULT_QUOTA_COST = 1
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+
+class QuotaBudgetExceeded(Exception):
+    """Исключение, вызываемое перед запросом, который превысил бы заданный бюджет квоты."""
+
+
+def quota_cost(resource: str, method: str) -> int:
+    """Возвращает оценку стоимости запроса в единицах квоты."""
+    return QUOTA_COSTS.get((resource, method), DEFAULT_QUOTA_COST)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин в формате Prometheus."""
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """
+        :param buckets: Верхние границы корзин по возрастанию.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        """Возвращает пары (граница le, накопленное количество), включая '+Inf'."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+
+class ApiStats:
+    """
+    Статистика запросов к API: количество вызовов, задержки, объем ответов,
+    количество элементов, попадания в кэш и израсходованная квота.
+
+    Attributes:
+        calls (Counter): Количество вызовов по (resource, method, cache), где cache -
+            'hit', 'miss', 'revalidated' или 'off'.
+        parts (Counter): Количество вызовов по (resource, part).
+        items (Counter): Количество полученных элементов по resource.
+        quota_used (int): Израсходованные единицы квоты.
+        quota_budget (int | None): Бюджет квоты, при превышении которого запросы не отправляются.
+        latency (Histogram): Задержка запросов в секундах.
+        response_bytes (Histogram): Примерный размер ответов в байтах (по JSON-представлению).
+    """
+    def __init__(self, quota_budget: int | None = None) -> None:
+        """
+        :param quota_budget: Максимальное количество единиц квоты или None без ограничения.
+        """
+        self.quota_budget = quota_budget
+        self.quota_used = 0
+        self.calls = Counter()
+        self.parts = Counter()
+        self.items = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self._lock = threading.Lock()
+
+    def charge(self, resource: str, method: str) -> None:
+        """
+        Списывает стоимость запроса из бюджета квоты перед его отправкой.
+
+        :raises QuotaBudgetExceeded: Если запрос превысил бы бюджет.
+        """
+        cost = quota_cost(resource, method)
+        with self._lock:
+            if self.quota_budget is not None and self.quota_used + cost > self.quota_budget:
+                raise QuotaBudgetExceeded(f'Запрос {resource}.{method} превысит бюджет квоты: '
+                                          f'израсходовано {self.quota_used} из {self.quota_budget}')
+            self.quota_used += cost
+
+    def record(self, resource: str, method: str, params: dict, response: dict,
+               latency: float, cache: str = 'off') -> None:
+        """
+        Записывает выполненный запрос.
+
+        :param resource: Ресурс API, например 'videos'.
+        :param method: Метод ресурса, например 'list'.
+        :param params: Параметры запроса.
+        :param response: Ответ API.
+        :param latency: Время выполнения в секундах.
+        :param cache: Результат обращения к кэшу: 'hit', 'miss', 'revalidated' или 'off'.
+        """
+        size = len(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+        with self._lock:
+            self.calls[resource, method, cache] += 1
+            for part in str(params.get('part', '')).split(','):
+                if part:
+                    self.parts[resource, part] += 1
+            self.items[resource] += len(response.get('items', []))
+            self.latency.observe(latency)
+            self.response_bytes.observe(size)
+
+    @property
+    def total_calls(self) -> int:
+        """Возвращает общее количество вызовов, включая ответы из кэша."""
+        return sum(self.calls.values())
+
+    @property
+    def network_calls(self) -> int:
+        """Возвращает количество вызовов, дошедших до API."""
+        return sum(count for (_, _, cache), count in self.calls.items() if cache != 'hit')
+
+    def to_prometheus(self, prefix: str = 'youtube_api') -> str:
+        """Возвращает статистику в текстовом формате экспозиции Prometheus."""
+        lines = [f'# TYPE {prefix}_calls_total counter']
+        for (resource, method, cache), count in sorted(self.calls.items()):
+            lines.append(f'{prefix}_calls_total{{resource="{resource}",method="{method}",cache="{cache}"}} {count}')
+        lines.append(f'# TYPE {prefix}_items_total counter')
+        for resource, count in sorted(self.items.items()):
+            lines.append(f'{prefix}_items_total{{resource="{resource}"}} {count}')
+        lines.append(f'# TYPE {prefix}_quota_units_total counter')
+        lines.append(f'{prefix}_quota_units_total {self.quota_used}')
+        for name, histogram in (('latency_seconds', self.latency), ('response_bytes', self.response_bytes)):
+            lines.append(f'# TYPE {prefix}_{name} histogram')
+            for bound, count in histogram.cumulative():
+                lines.append(f'{prefix}_{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{prefix}_{name}_sum {histogram.sum}')
+            lines.append(f'{prefix}_{name}_count {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+_active: list[ApiStats] = []
+_active_lock = threading.Lock()
+
+
+def active() -> list[ApiStats]:
+    """Возвращает список активных сборщиков статистики."""
+    return _active
+
+
+def charge(resource: str, method: str) -> None:
+    """Списывает стоимость запроса во всех активных сборщиках."""
+    for stats in tuple(_active):
+        stats.charge(resource, method)
+
+
+def record(resource: str, method: str, params: dict, response: dict, latency: float, cache: str = 'off') -> None:
+    """Записывает выполненный запрос во все активные сборщики."""
+    for stats in tuple(_active):
+        stats.record(resource, method, params, response, latency, cache)
+
+
+@contextmanager
+def youtube_stats(quota_budget: int | None = None) -> Iterator[ApiStats]:
+    """
+    Собирает статистику всех запросов к API внутри блока with, из любых потоков.
+
+    Пример:
+        with youtube_stats(quota_budget=500) as s:
+            PlayList('PL...').show_best_video()
+        print(s.network_calls, s.quota_used)
+
+    :param quota_budget: Бюджет квоты; запрос сверх бюджета вызывает QuotaBudgetExceeded.
+    """
+    stats = ApiStats(quota_budget)
+    with _active_lock:
+        _active.append(stats)
+    try:
+        yield stats
+    finally:
+        with _active_lock:
+            _active.remove(stats)
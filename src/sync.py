@@ -0,0 +1,225 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from src.fields import plan
+from src.playlist import PlayList
+from src.youtube import YouTubeMixin, chunked
+
+
+class SnapshotStore:
+    """
+    Локальное хранилище снимков плейлистов и статистики видео в файле SQLite.
+
+    Таблицы:
+        channels: id канала и id его плейлиста загрузок (uploads).
+        playlist_items: элементы плейлистов (id элемента, id видео, позиция, дата публикации, etag).
+        video_stats: последняя статистика видео и время ее получения. Для видео, которых API
+            не вернул (удаленных или закрытых), хранится запись без счетчиков, чтобы не запрашивать их снова.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS channels (
+                channel_id TEXT PRIMARY KEY, uploads_playlist_id TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS playlist_items (
+                playlist_id TEXT NOT NULL, item_id TEXT NOT NULL, video_id TEXT NOT NULL,
+                position INTEGER, published_at TEXT, etag TEXT,
+                PRIMARY KEY (playlist_id, item_id));
+            CREATE TABLE IF NOT EXISTS video_stats (
+                video_id TEXT PRIMARY KEY, view_count INTEGER, like_count INTEGER,
+                comment_count INTEGER, fetched_at REAL NOT NULL);
+        ''')
+        self._connection.commit()
+
+    def uploads_playlist_id(self, channel_id: str) -> str | None:
+        """Возвращает сохраненный id плейлиста загрузок канала или None."""
+        with self._lock:
+            row = self._connection.execute('SELECT uploads_playlist_id FROM channels WHERE channel_id = ?',
+                                           (channel_id,)).fetchone()
+        return row[0] if row else None
+
+    def save_uploads_playlist_id(self, channel_id: str, playlist_id: str) -> None:
+        """Сохраняет id плейлиста загрузок канала."""
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO channels VALUES (?, ?)', (channel_id, playlist_id))
+            self._connection.commit()
+
+    def known_items(self, playlist_id: str) -> set[str]:
+        """Возвращает id уже сохраненных элементов плейлиста."""
+        with self._lock:
+            rows = self._connection.execute('SELECT item_id FROM playlist_items WHERE playlist_id = ?',
+                                            (playlist_id,)).fetchall()
+        return {item_id for (item_id,) in rows}
+
+    def add_items(self, playlist_id: str, items: list[dict]) -> None:
+        """Сохраняет элементы ответа playlistItems().list."""
+        rows = [(playlist_id, item['id'], item['contentDetails']['videoId'], item['snippet'].get('position'),
+                 item['snippet'].get('publishedAt'), item.get('etag')) for item in items]
+        with self._lock:
+            self._connection.executemany('INSERT OR REPLACE INTO playlist_items VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self._connection.commit()
+
+    def video_ids(self, playlist_id: str) -> list[str]:
+        """
+        Возвращает id видео плейлиста, начиная с последних добавленных.
+
+        Порядок определяется датой добавления, а не сохраненной позицией: позиции в плейлисте
+        загрузок сдвигаются с каждым новым видео, а сохраняются только при первой встрече элемента.
+        """
+        with self._lock:
+            rows = self._connection.execute('SELECT video_id FROM playlist_items WHERE playlist_id = ? '
+                                            'ORDER BY published_at DESC, item_id', (playlist_id,)).fetchall()
+        return [video_id for (video_id,) in rows]
+
+    def stale_videos(self, video_ids: Iterable[str], older_than: float) -> list[str]:
+        """
+        Возвращает видео без статистики или со статистикой, полученной раньше older_than.
+
+        :param video_ids: Идентификаторы видео.
+        :param older_than: Граница устаревания (unix time).
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        fresh = set()
+        with self._lock:
+            for chunk in chunked(video_ids, 500):
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._connection.execute(f'SELECT video_id FROM video_stats WHERE video_id IN ({placeholders}) '
+                                                f'AND fetched_at >= ?', (*chunk, older_than)).fetchall()
+                fresh.update(video_id for (video_id,) in rows)
+        return [video_id for video_id in video_ids if video_id not in fresh]
+
+    def save_stats(self, items: list[dict], fetched_at: float) -> None:
+        """Сохраняет статистику из элементов ответа videos().list."""
+        rows = [(item['id'], int(item['statistics'].get('viewCount', 0)), int(item['statistics'].get('likeCount', 0)),
+                 int(item['statistics'].get('commentCount', 0)), fetched_at) for item in items]
+        with self._lock:
+            self._connection.executemany('INSERT OR REPLACE INTO video_stats VALUES (?, ?, ?, ?, ?)', rows)
+            self._connection.commit()
+
+    def save_missing(self, video_ids: Iterable[str], fetched_at: float) -> None:
+        """Сохраняет записи без счетчиков для видео, которых API не вернул (удаленных или закрытых)."""
+        rows = [(video_id, None, None, None, fetched_at) for video_id in video_ids]
+        with self._lock:
+            self._connection.executemany('INSERT OR REPLACE INTO video_stats VALUES (?, ?, ?, ?, ?)', rows)
+            self._connection.commit()
+
+    def stats(self, video_id: str) -> dict | None:
+        """
+        Возвращает сохраненную статистику видео или None, если ее нет.
+
+        Для удаленных или закрытых видео счетчики равны None.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT view_count, like_count, comment_count, fetched_at '
+                                           'FROM video_stats WHERE video_id = ?', (video_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('view_count', 'like_count', 'comment_count', 'fetched_at'), row))
+
+
+class SyncResult:
+    """Итог синхронизации плейлиста."""
+    def __init__(self, playlist_id: str, new_items: int, refreshed: int, pages: int) -> None:
+        """
+        :param playlist_id: Идентификатор плейлиста.
+        :param new_items: Количество новых элементов.
+        :param refreshed: Количество видео с обновленной статистикой.
+        :param pages: Количество запрошенных страниц плейлиста.
+        """
+        self.playlist_id = playlist_id
+        self.new_items = new_items
+        self.refreshed = refreshed
+        self.pages = pages
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}({self.playlist_id}, new_items={self.new_items}, "
+                f"refreshed={self.refreshed}, pages={self.pages})")
+
+
+class SyncEngine(YouTubeMixin):
+    """
+    Инкрементальная синхронизация каналов и плейлистов.
+
+    Страницы плейлиста перебираются с начала, и перебор останавливается на странице, где встретился
+    уже известный элемент. Статистика запрашивается только для видео, у которых она старше stale_after.
+    """
+    UPLOADS_PARTS, UPLOADS_FIELDS_MASK = plan(['contentDetails/relatedPlaylists/uploads'])
+    STATISTICS_PARTS, STATISTICS_FIELDS_MASK = plan(['statistics/viewCount', 'statistics/likeCount',
+                                                     'statistics/commentCount'])
+
+    def __init__(self, store: SnapshotStore, stale_after: float = 60 * 60) -> None:
+        """
+        :param store: Хранилище снимков.
+        :param stale_after: Через сколько секунд статистика видео считается устаревшей.
+        """
+        self.store = store
+        self.stale_after = stale_after
+
+    def uploads_playlist_id(self, channel_id: str) -> str:
+        """Возвращает id плейлиста загрузок канала, запрашивая его у API только один раз."""
+        playlist_id = self.store.uploads_playlist_id(channel_id)
+        if playlist_id is None:
+            response = self.YOUTUBE.channels().list(part=self.UPLOADS_PARTS, id=channel_id,
+                                                    fields=self.UPLOADS_FIELDS_MASK).execute()
+            items = response.get('items', [])
+            if not items:
+                raise ValueError(f"Канал '{channel_id}' не найден")
+            playlist_id = items[0]['contentDetails']['relatedPlaylists']['uploads']
+            self.store.save_uploads_playlist_id(channel_id, playlist_id)
+        return playlist_id
+
+    def sync_channel(self, channel_id: str) -> SyncResult:
+        """
+        Синхронизирует плейлист загрузок канала.
+
+        :param channel_id: Уникальный идентификатор канала YouTube
+        """
+        return self.sync_playlist(self.uploads_playlist_id(channel_id))
+
+    def sync_playlist(self, playlist_id: str, stop_at_known: bool = True) -> SyncResult:
+        """
+        Сохраняет новые элементы плейлиста и обновляет устаревшую статистику его видео.
+
+        :param playlist_id: Идентификатор плейлиста.
+        :param stop_at_known: Остановиться на первой странице с уже известным элементом.
+            Подходит для плейлистов загрузок, где новые видео идут первыми; для плейлистов,
+            в которые видео добавляются в конец, передайте False.
+        """
+        known = self.store.known_items(playlist_id)
+        new_items = []
+        pages = 0
+        for page in PlayList.lazy(playlist_id).iter_pages():
+            pages += 1
+            items = [item for item in page['items'] if item['id'] not in known]
+            new_items.extend(items)
+            if stop_at_known and len(items) < len(page['items']):
+                break
+        self.store.add_items(playlist_id, new_items)
+        refreshed = self.refresh_stats(self.store.video_ids(playlist_id))
+        return SyncResult(playlist_id, len(new_items), refreshed, pages)
+
+    def refresh_stats(self, video_ids: Iterable[str]) -> int:
+        """
+        Запрашивает пачками по 50 id статистику видео, у которых она устарела.
+
+        :param video_ids: Идентификаторы видео.
+        :return: Количество видео с обновленной статистикой.
+        """
+        now = time.time()
+        refreshed = 0
+        for chunk in chunked(self.store.stale_videos(video_ids, now - self.stale_after)):
+            response = self.YOUTUBE.videos().list(part=self.STATISTICS_PARTS, id=','.join(chunk),
+                                                  fields=self.STATISTICS_FIELDS_MASK).execute()
+            items = response.get('items', [])
+            self.store.save_stats(items, now)
+            returned = {item['id'] for item in items}
+            self.store.save_missing((video_id for video_id in chunk if video_id not in returned), now)
+            refreshed += len(items)
+        return refreshed
@@ -0,0 +1,259 @@
+import bisect
+import datetime
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterable, Iterator
+
+# Запись фиксированной длины 64 байта: время (unix, секунды), id (до 32 байт) и три счетчика.
+RECORD = struct.Struct('<q32sQQQ')
+# Запись индекса снимков: время снимка, номер первой записи и количество записей снимка.
+SNAPSHOT = struct.Struct('<qQQ')
+CHANNEL_FIELDS = ('subscriber_count', 'view_count', 'video_count')
+VIDEO_FIELDS = ('view_count', 'like_count', 'comment_count')
+
+
+def _timestamp(value: datetime.datetime | float | None, default: float) -> int:
+    """Приводит datetime или unix time к целому количеству секунд."""
+    if value is None:
+        return int(default)
+    if isinstance(value, datetime.datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def _truncate_partial(path: str, size: int) -> int:
+    """
+    Отрезает неполную последнюю запись, оставшуюся после сбоя во время записи.
+
+    :param path: Путь к файлу из записей фиксированной длины.
+    :param size: Длина записи в байтах.
+    :return: Количество полных записей в файле.
+    """
+    if not os.path.exists(path):
+        return 0
+    length = os.path.getsize(path)
+    if length % size:
+        with open(path, 'r+b') as f:
+            f.truncate(length - length % size)
+    return length // size
+
+
+class TimeSeries:
+    """
+    Журнал значений счетчиков в файле из записей фиксированной длины, только для дозаписи.
+
+    Записи добавляются в порядке неубывания времени, поэтому диапазон по времени находится
+    двоичным поиском, а чтение идет через mmap без загрузки файла в память.
+
+    Каждый вызов append образует снимок, записи которого упорядочены по id. Снимки перечислены
+    в индексе <path>.idx, поэтому история одной сущности находится двоичным поиском внутри
+    каждого снимка, а не просмотром всех записей диапазона. Неполная запись в конце файла
+    (после сбоя во время записи) отрезается перед следующей дозаписью.
+    """
+    def __init__(self, path: str, fields: tuple[str, str, str]) -> None:
+        """
+        :param path: Путь к файлу журнала.
+        :param fields: Названия трех счетчиков записи.
+        """
+        self.path = path
+        self.index_path = path + '.idx'
+        self.fields = fields
+        self._lock = threading.Lock()
+        self._count = None
+        self._last_timestamp = None
+
+    def append(self, rows: Iterable[tuple[str, int, int, int]], timestamp: datetime.datetime | float | None = None) -> int:
+        """
+        Дописывает значения счетчиков с общей отметкой времени.
+
+        :param rows: Кортежи (id, счетчик 1, счетчик 2, счетчик 3).
+        :param timestamp: Время снимка; по умолчанию текущее.
+        :return: Количество записанных записей.
+        :raises ValueError: Если время раньше последней записи или id длиннее 32 байт.
+        """
+        timestamp = _timestamp(timestamp, time.time())
+        records = []
+        for entity_id, first, second, third in rows:
+            key = entity_id.encode('ascii')
+            if len(key) > 32:
+                raise ValueError(f"Идентификатор '{entity_id}' длиннее 32 байт")
+            records.append((key.ljust(32, b'\0'), first, second, third))
+        records.sort(key=lambda record: record[0])
+        buffer = b''.join(RECORD.pack(timestamp, *record) for record in records)
+        with self._lock:
+            if self._count is None:
+                self._count, self._last_timestamp = self._recover()
+            if self._last_timestamp is not None and timestamp < self._last_timestamp:
+                raise ValueError('Записи должны добавляться в порядке неубывания времени')
+            if not records:
+                return 0
+            try:
+                with open(self.path, 'ab') as f:
+                    f.write(buffer)
+                with open(self.index_path, 'ab') as f:
+                    f.write(SNAPSHOT.pack(timestamp, self._count, len(records)))
+            except BaseException:
+                self._count = None
+                raise
+            self._count += len(records)
+            self._last_timestamp = timestamp
+        return len(records)
+
+    def _recover(self) -> tuple[int, int | None]:
+        """
+        Приводит журнал и индекс в согласованное состояние после возможного сбоя.
+
+        Отрезает неполные записи, убирает из индекса снимки, которых нет в журнале,
+        и добавляет в индекс снимок, записанный в журнал, но не попавший в индекс.
+
+        :return: Количество записей и время последней записи (None для пустого журнала).
+        """
+        count = _truncate_partial(self.path, RECORD.size)
+        _truncate_partial(self.index_path, SNAPSHOT.size)
+        snapshots = self._snapshots()
+        kept = snapshots
+        while kept and kept[-1][1] + kept[-1][2] > count:
+            kept = kept[:-1]
+        if len(kept) != len(snapshots):
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(len(kept) * SNAPSHOT.size)
+        if not count:
+            return 0, None
+        covered = kept[-1][1] + kept[-1][2] if kept else 0
+        with open(self.path, 'rb') as f:
+            if covered < count:
+                f.seek(covered * RECORD.size)
+                timestamp = RECORD.unpack(f.read(RECORD.size))[0]
+                with open(self.index_path, 'ab') as index:
+                    index.write(SNAPSHOT.pack(timestamp, covered, count - covered))
+            f.seek((count - 1) * RECORD.size)
+            return count, RECORD.unpack(f.read(RECORD.size))[0]
+
+    def _snapshots(self) -> list[tuple[int, int, int]]:
+        """Возвращает полные записи индекса снимков: (время, номер первой записи, количество)."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        return list(SNAPSHOT.iter_unpack(data[:len(data) - len(data) % SNAPSHOT.size]))
+
+    @staticmethod
+    def _bisect(view, count: int, timestamp: int) -> int:
+        """Возвращает индекс первой записи со временем не меньше timestamp."""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from('<q', view, middle * RECORD.size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def _bisect_key(view, low: int, high: int, key: bytes) -> int:
+        """Возвращает индекс первой записи снимка [low, high) с id не меньше key."""
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * RECORD.size + 8
+            if view[offset:offset + 32] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def scan(self, since: datetime.datetime | float | None = None,
+             until: datetime.datetime | float | None = None) -> Iterator[tuple[int, str, int, int, int]]:
+        """
+        Перебирает записи в диапазоне времени [since, until).
+
+        :return: Итератор по кортежам (время, id, счетчик 1, счетчик 2, счетчик 3).
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < RECORD.size:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            count = len(view) // RECORD.size
+            start = self._bisect(view, count, _timestamp(since, 0)) if since is not None else 0
+            stop = self._bisect(view, count, _timestamp(until, 0)) if until is not None else count
+            for offset in range(start * RECORD.size, stop * RECORD.size, RECORD.size):
+                timestamp, key, first, second, third = RECORD.unpack_from(view, offset)
+                yield timestamp, key.rstrip(b'\0').decode('ascii'), first, second, third
+
+    def history(self, entity_id: str, since: datetime.datetime | float | None = None,
+                until: datetime.datetime | float | None = None, step: int | None = None) -> list[dict]:
+        """
+        Возвращает историю счетчиков одной сущности.
+
+        :param entity_id: id канала или видео.
+        :param since: Начало диапазона (включительно).
+        :param until: Конец диапазона (не включительно).
+        :param step: Шаг прореживания в секундах: из каждого интервала берется последнее значение.
+        :return: Список словарей {'timestamp': ..., <счетчики>} по возрастанию времени.
+        """
+        key = entity_id.encode('ascii').ljust(32, b'\0')
+        points = {}
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < RECORD.size:
+            return []
+        snapshots = self._snapshots()
+        times = [snapshot[0] for snapshot in snapshots]
+        low = bisect.bisect_left(times, _timestamp(since, 0)) if since is not None else 0
+        high = bisect.bisect_left(times, _timestamp(until, 0)) if until is not None else len(snapshots)
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            count = len(view) // RECORD.size
+            for timestamp, first, size in snapshots[low:high]:
+                stop = min(first + size, count)
+                index = self._bisect_key(view, first, stop, key)
+                while index < stop and view[index * RECORD.size + 8:index * RECORD.size + 40] == key:
+                    _, _, *values = RECORD.unpack_from(view, index * RECORD.size)
+                    points[timestamp // step * step if step else timestamp] = values
+                    index += 1
+        return [{'timestamp': timestamp, **dict(zip(self.fields, values))} for timestamp, values in points.items()]
+
+
+class StatsStore:
+    """
+    Хранилище истории статистики каналов и видео в каталоге из двух журналов:
+    channels.bin (подписчики, просмотры, видео) и videos.bin (просмотры, лайки, комментарии).
+    """
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Каталог хранилища (создается при необходимости).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.channels = TimeSeries(os.path.join(directory, 'channels.bin'), CHANNEL_FIELDS)
+        self.videos = TimeSeries(os.path.join(directory, 'videos.bin'), VIDEO_FIELDS)
+
+    def append_channels(self, channels: Iterable, timestamp: datetime.datetime | float | None = None) -> int:
+        """
+        Записывает снимок статистики каналов.
+
+        :param channels: Объекты Channel или ChannelRecord. Ненайденные каналы пропускаются.
+        :param timestamp: Время снимка; по умолчанию текущее.
+        :return: Количество записанных записей.
+        """
+        records = (channel if not hasattr(channel, 'to_record') else channel.to_record() for channel in channels)
+        return self.channels.append(((record.channel_id, record.subscriber_count, record.view_count, record.video_count)
+                                     for record in records if record is not None), timestamp)
+
+    def append_videos(self, videos: Iterable, timestamp: datetime.datetime | float | None = None) -> int:
+        """
+        Записывает снимок статистики видео.
+
+        :param videos: Объекты Video, PLVideo или VideoRecord. Ненайденные видео пропускаются.
+        :param timestamp: Время снимка; по умолчанию текущее.
+        :return: Количество записанных записей.
+        """
+        records = (video if not hasattr(video, 'to_record') else video.to_record() for video in videos)
+        return self.videos.append(((record.video_id, record.view_count, record.like_count, record.comment_count)
+                                   for record in records if record is not None), timestamp)
+
+    def channel_history(self, channel_id: str, since=None, until=None, step: int | None = None) -> list[dict]:
+        """Возвращает историю подписчиков, просмотров и количества видео канала (см. TimeSeries.history)."""
+        return self.channels.history(channel_id, since, until, step)
+
+    def video_history(self, video_id: str, since=None, until=None, step: int | None = None) -> list[dict]:
+        """Возвращает историю просмотров, лайков и комментариев видео (см. TimeSeries.history)."""
+        return self.videos.history(video_id, since, until, step)
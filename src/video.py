@@ -1,8 +1,26 @@
 
-from src.youtube import YouTubeMixin
+import asyncio
+from typing import Iterable
 
-class Video(YouTubeMixin):
+from src import aio
+from src.fields import plan
+from src.lazy import RESOLVER, LazyMixin
+from src.records import VideoRecord
+from src.youtube import YouTubeMixin, chunked
+
+class Video(LazyMixin, YouTubeMixin):
     """Класс для работы с видео YouTube."""
+    RESOURCE = 'videos'
+    # Поля ответа API, из которых заполняются атрибуты при создании объекта.
+    # Включают все поля VideoRecord, чтобы to_record не требовал дополнительных запросов.
+    FIELDS = {'title': 'snippet/title', 'like_count': 'statistics/likeCount', 'view_count': 'statistics/viewCount',
+              'comment_count': 'statistics/commentCount'}
+    # Поля, которые запрашиваются отдельно при первом обращении к атрибуту.
+    EXTRA_FIELDS = {'description': 'snippet/description', 'published_at': 'snippet/publishedAt',
+                    'duration': 'contentDetails/duration'}
+    PARTS, FIELDS_MASK = plan(FIELDS.values())
+    RECORD_PARTS, RECORD_FIELDS_MASK = plan(VideoRecord.PATHS)
+
     def __init__(self, video_id: str) -> None:
         """
         Извлекает информацию о видео с помощью YouTube Data API v3
@@ -15,21 +33,180 @@ class Video(YouTubeMixin):
             url (str): Ссылка на видео
             view_count (str): Количество просмотров видео
             like_count (str): Количество лайков видео
+            comment_count (str | None): Количество комментариев (None, если комментарии отключены)
         """
         self.video_id = video_id
+        self.video_response = self.YOUTUBE.videos().list(part=self.PARTS, id=self.video_id,
+                                                         fields=self.FIELDS_MASK).execute()
         try:
-            self.video_response = self.YOUTUBE.videos().list(part='snippet,statistics', id=self.video_id).execute()
-            video_data = self.video_response['items'][0]
-            self.title = video_data['snippet']['title']
-            self.like_count = video_data['statistics']['likeCount']
-            self.url = f'https://www.youtube.com/watch?v={self.video_id}'
-            self.view_count = video_data['statistics']['viewCount']
+            self._fill(self.video_response['items'][0])
         except IndexError:
-            self.video_id = video_id
+            self._fill(None)
+
+    def _fill(self, video_data: dict | None) -> None:
+        """
+        Заполняет атрибуты видео из элемента ответа API.
+
+        :param video_data: Элемент `items` ответа videos().list или None, если видео не найдено.
+        """
+        self._defer_extras()
+        if video_data is None:
             self.title = None
             self.like_count = None
             self.url = None
             self.view_count = None
+            self.comment_count = None
+            return
+        self.title = video_data['snippet']['title']
+        self.like_count = video_data['statistics']['likeCount']
+        self.url = f'https://www.youtube.com/watch?v={self.video_id}'
+        self.view_count = video_data['statistics']['viewCount']
+        self.comment_count = video_data['statistics'].get('commentCount')
+
+    def _resource_id(self) -> str:
+        """Возвращает id видео для дополнительных запросов полей."""
+        return self.video_id
+
+    @classmethod
+    def _fetch_items(cls, video_ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Получает данные о видео пачками по 50 id за один запрос.
+
+        :param video_ids: Идентификаторы видео.
+        :return: Словарь {id видео: элемент ответа API}. Ненайденные видео в словарь не попадают.
+        """
+        found = {}
+        for chunk in chunked(dict.fromkeys(video_ids)):
+            response = cls.YOUTUBE.videos().list(part=cls.PARTS, id=','.join(chunk),
+                                                 fields=cls.FIELDS_MASK).execute()
+            for item in response.get('items', []):
+                found[item['id']] = item
+        return found
+
+    @classmethod
+    def _from_item(cls, video_id: str, video_data: dict | None) -> 'Video':
+        """
+        Создает объект видео из уже полученного элемента ответа API, не обращаясь к сети.
+
+        :param video_id: id видео
+        :param video_data: Элемент `items` ответа videos().list или None, если видео не найдено.
+        """
+        video = cls.__new__(cls)
+        video.video_id = video_id
+        video._load(video_data)
+        return video
+
+    def _load(self, video_data: dict | None) -> None:
+        """Сохраняет элемент ответа API как ответ по этому видео и заполняет атрибуты."""
+        self.video_response = {'items': [video_data] if video_data is not None else []}
+        self._fill(video_data)
+
+    @classmethod
+    def _load_many(cls, videos: list['Video']) -> None:
+        """Загружает данные для списка отложенных видео одним запросом на каждые 50 id."""
+        found = cls._fetch_items(video.video_id for video in videos)
+        for video in videos:
+            video._load(found.get(video.video_id))
+
+    @classmethod
+    def records(cls, video_ids: Iterable[str], keep_raw: bool = False) -> list[VideoRecord]:
+        """
+        Загружает видео пачками по 50 id в компактном виде.
+
+        В памяти одновременно хранится не более одного ответа API. Ненайденные видео пропускаются.
+
+        :param video_ids: Идентификаторы видео.
+        :param keep_raw: Сохранить исходные элементы ответа в атрибуте `raw` записей.
+        :return: Список записей в порядке переданных id.
+        """
+        records = []
+        for chunk in chunked(dict.fromkeys(video_ids)):
+            response = cls.YOUTUBE.videos().list(part=cls.RECORD_PARTS, id=','.join(chunk),
+                                                 fields=cls.RECORD_FIELDS_MASK).execute()
+            found = {item['id']: item for item in response.get('items', [])}
+            records.extend(VideoRecord.from_item(found[video_id], keep_raw)
+                           for video_id in chunk if video_id in found)
+        return records
+
+    def to_record(self, keep_raw: bool = False) -> VideoRecord | None:
+        """
+        Возвращает компактное представление видео или None, если видео не найдено.
+
+        :param keep_raw: Сохранить исходный элемент ответа в атрибуте `raw` записи.
+        """
+        items = self.video_response.get('items', [])
+        return VideoRecord.from_item(items[0], keep_raw) if items else None
+
+    @classmethod
+    async def afetch(cls, video_id: str) -> 'Video':
+        """
+        Асинхронно создает видео, получая данные через общий асинхронный клиент.
+
+        :param video_id: id видео
+        """
+        video = cls.__new__(cls)
+        video.video_id = video_id
+        video.video_response = await aio.get_client().list('videos', part=cls.PARTS, id=video_id,
+                                                                fields=cls.FIELDS_MASK)
+        items = video.video_response.get('items', [])
+        video._fill(items[0] if items else None)
+        return video
+
+    @classmethod
+    async def afetch_many(cls, video_ids: Iterable[str]) -> list['Video']:
+        """
+        Асинхронно создает несколько видео, запрашивая пачки по 50 id параллельно.
+
+        :param video_ids: Идентификаторы видео.
+        :return: Список видео в порядке переданных id.
+        """
+        video_ids = list(video_ids)
+        client = aio.get_client()
+        responses = await asyncio.gather(*(client.list('videos', part=cls.PARTS, id=','.join(chunk),
+                                                       fields=cls.FIELDS_MASK)
+                                           for chunk in chunked(dict.fromkeys(video_ids))))
+        found = {item['id']: item for response in responses for item in response.get('items', [])}
+        return [cls._from_item(video_id, found.get(video_id)) for video_id in video_ids]
+
+    @classmethod
+    def lazy(cls, video_id: str) -> 'Video':
+        """
+        Создает видео без обращения к API.
+
+        Данные загружаются при первом обращении к атрибуту (title, like_count, ...),
+        причем вместе с ним одним запросом загружаются и другие ожидающие видео.
+
+        :param video_id: id видео
+        """
+        video = cls.__new__(cls)
+        video.video_id = video_id
+        RESOLVER.register(video, Video._load_many)
+        return video
+
+    @classmethod
+    def bulk(cls, video_ids: Iterable[str]) -> list['Video']:
+        """
+        Создает несколько объектов видео, запрашивая данные пачками по 50 id.
+
+        Вместо одного запроса на каждое видео выполняется ceil(N / 50) запросов.
+        Для ненайденных видео атрибуты заполняются None, как и в конструкторе.
+
+        :param video_ids: Идентификаторы видео.
+        :return: Список видео в порядке переданных id.
+        """
+        video_ids = list(video_ids)
+        found = cls._fetch_items(video_ids)
+        return [cls._from_item(video_id, found.get(video_id)) for video_id in video_ids]
+
+    def to_dict(self) -> dict:
+        """Возвращает данные о видео в виде словаря."""
+        return {"id": self.video_id,
+                "title": self.title,
+                "url": self.url,
+                "viewCount": self.view_count,
+                "likeCount": self.like_count,
+                }
+
     def __repr__(self):
         """
         Возвращает строковое представление объекта для разработчиков.
@@ -59,6 +236,39 @@ class PLVideo(Video):
         self.video_id = video_id
         self.playlist_id = playlist_id
 
+    @classmethod
+    def bulk(cls, pairs: Iterable[tuple[str, str]]) -> list['PLVideo']:
+        """
+        Создает несколько объектов видео из плейлистов, запрашивая данные пачками по 50 id.
+
+        :param pairs: Пары (id видео, id плейлиста).
+        :return: Список видео в порядке переданных пар.
+        """
+        pairs = list(pairs)
+        found = cls._fetch_items(video_id for video_id, _ in pairs)
+        videos = []
+        for video_id, playlist_id in pairs:
+            video = cls._from_item(video_id, found.get(video_id))
+            video.playlist_id = playlist_id
+            videos.append(video)
+        return videos
+
+    @classmethod
+    def lazy(cls, video_id: str, playlist_id: str) -> 'PLVideo':
+        """
+        Создает видео из плейлиста без обращения к API.
+
+        :param video_id: - id видео
+        :param playlist_id: - id плейлиста
+        """
+        video = super().lazy(video_id)
+        video.playlist_id = playlist_id
+        return video
+
+    def to_dict(self) -> dict:
+        """Возвращает данные о видео и id плейлиста в виде словаря."""
+        return {**super().to_dict(), "playlistId": self.playlist_id}
+
     def __repr__(self):
         """
         Возвращает строковое представление объекта для разработчиков.
@@ -1,7 +1,261 @@
-
 import os
+import threading
+import time
+from typing import Callable, Iterable, Iterator
+
+from src import stats
+from src.broker import RequestBroker
+from src.cache import ResponseCache, SQLiteCache
+from src.retry import ResilientExecutor
+
+MAX_RESULTS = 50
+
+
+def build_service(http=None):
+    """
+    Создает объект службы API YouTube.
+
+    Документ обнаружения (discovery document) загружается из статического файла без обращения к сети:
+    по пути из переменной среды YOUTUBE_DISCOVERY_PATH, если она задана, иначе из файла,
+    поставляемого вместе с google-api-python-client.
+
+    :param http: Транспорт httplib2.Http (или совместимый) или None для транспорта по умолчанию.
+    :return: Объект службы API YouTube.
+    """
+    from googleapiclient.discovery import build, build_from_document
+
+    api_key = os.getenv('API_KEY')
+    discovery_path = os.getenv('YOUTUBE_DISCOVERY_PATH')
+    if discovery_path:
+        with open(discovery_path, encoding='utf-8') as f:
+            return build_from_document(f.read(), developerKey=api_key, http=http)
+    return build('youtube', 'v3', developerKey=api_key, http=http, static_discovery=True, cache_discovery=False)
+
+
+def build_http():
+    """Создает HTTP-транспорт googleapiclient для одного потока."""
+    from googleapiclient.http import build_http as build_googleapiclient_http
+
+    return build_googleapiclient_http()
+
+
+def is_not_modified(error: Exception) -> bool:
+    """Возвращает True, если исключение googleapiclient означает ответ 304 Not Modified."""
+    return getattr(getattr(error, 'resp', None), 'status', None) == 304
+
+
+def chunked(ids: Iterable[str], size: int = MAX_RESULTS) -> Iterator[list[str]]:
+    """
+    Разбивает последовательность идентификаторов на пачки для одного запроса к API.
+
+    :param ids: Идентификаторы ресурсов YouTube.
+    :param size: Максимальный размер пачки (API принимает не более 50 id за запрос).
+    :return: Итератор по спискам идентификаторов.
+    """
+    chunk = []
+    for resource_id in ids:
+        chunk.append(resource_id)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ApiRequest:
+    """Отложенный запрос к API, выполняемый через ApiClient."""
+    def __init__(self, client: 'ApiClient', resource: str, method: str, params: dict) -> None:
+        """
+        :param client: Клиент, выполняющий запрос.
+        :param resource: Ресурс API, например 'videos'.
+        :param method: Метод ресурса, например 'list'.
+        :param params: Параметры запроса.
+        """
+        self.client = client
+        self.resource = resource
+        self.method = method
+        self.params = {key: value for key, value in params.items() if value is not None}
+
+    def execute(self) -> dict:
+        """Выполняет запрос и возвращает ответ API."""
+        return self.client.execute(self)
+
+
+class ApiResource:
+    """
+    Ресурс API (channels, videos, playlistItems, ...), создающий ApiRequest.
+
+    Методы, кроме list и list_next, передаются ресурсу googleapiclient без изменений.
+    """
+    def __init__(self, client: 'ApiClient', resource: str) -> None:
+        self.client = client
+        self.resource = resource
+
+    def list(self, **params) -> ApiRequest:
+        """Возвращает запрос resource().list(**params)."""
+        return ApiRequest(self.client, self.resource, 'list', params)
+
+    def list_next(self, previous_request: ApiRequest, previous_response: dict) -> ApiRequest | None:
+        """
+        Возвращает запрос следующей страницы или None, если страниц больше нет (как в googleapiclient).
+
+        :param previous_request: Запрос предыдущей страницы.
+        :param previous_response: Ответ на него.
+        """
+        page_token = previous_response.get('nextPageToken')
+        if not page_token:
+            return None
+        return ApiRequest(self.client, self.resource, 'list', {**previous_request.params, 'pageToken': page_token})
+
+    def __getattr__(self, name: str):
+        """Возвращает остальные методы ресурса googleapiclient (insert, update, delete, ...)."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(getattr(self.client.service, self.resource)(), name)
+
+
+class ApiClient:
+    """
+    Обертка над объектом службы API YouTube, через которую проходят все запросы.
+
+    Повторяет интерфейс googleapiclient (`client.videos().list(...).execute()`) и
+    добавляет кэширование ответов с проверкой актуальности по `etag`.
+
+    Объект службы создается при первом запросе, а не при импорте, и пересоздается
+    в дочернем процессе после fork. Вместо него можно подставить любой объект
+    с тем же интерфейсом, например заглушку для тестов или работы без сети.
+
+    Запросы проходят через RequestBroker, который не дает отправлять одинаковые запросы
+    одновременно. Так как httplib2.Http не потокобезопасен, созданная через factory служба
+    выполняет запросы через отдельный HTTP-транспорт в каждом потоке.
+    """
+    def __init__(self, service=None, cache: ResponseCache | None = None,
+                 factory: Callable[[], object] = build_service, broker: RequestBroker | None = None,
+                 http_factory: Callable[[], object] | None = build_http,
+                 executor: ResilientExecutor | None = None) -> None:
+        """
+        :param service: Объект службы API YouTube или None, чтобы создать его через factory при первом запросе.
+        :param cache: Кэш ответов или None, если кэширование не нужно.
+        :param factory: Функция, создающая объект службы API YouTube.
+        :param broker: Посредник для объединения одновременных запросов или None.
+        :param http_factory: Функция, создающая HTTP-транспорт для потока, или None, чтобы
+            использовать транспорт службы. Для подставленной службы не используется.
+        :param executor: Слой повторов и ограничения частоты (по умолчанию ResilientExecutor()).
+        """
+        self._service = service
+        self._injected = service is not None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.factory = factory
+        self.cache = cache
+        self.broker = broker if broker is not None else RequestBroker()
+        self.http_factory = http_factory
+        self.executor = executor if executor is not None else ResilientExecutor()
+
+    @property
+    def service(self):
+        """Возвращает объект службы API YouTube, создавая его при первом обращении."""
+        if self._injected:
+            return self._service
+        with self._lock:
+            if self._service is None or self._pid != os.getpid():
+                self._service = self.factory()
+                self._pid = os.getpid()
+            return self._service
+
+    @service.setter
+    def service(self, service) -> None:
+        """
+        Подставляет объект службы API YouTube.
+
+        :param service: Объект с интерфейсом googleapiclient или None, чтобы вернуться к созданию через factory.
+        """
+        with self._lock:
+            self._service = service
+            self._injected = service is not None
+
+    def __getattr__(self, name: str):
+        """
+        Возвращает фабрику ресурса API, например `client.videos`.
+
+        Остальные атрибуты (new_batch_http_request и т. д.) берутся у объекта службы. Если служба
+        не описывает свои ресурсы (подставленная заглушка), любой ее атрибут считается ресурсом.
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+        service = self.service
+        resources = getattr(service, '_resourceDesc', {}).get('resources')
+        if resources is not None and name not in resources:
+            return getattr(service, name)
+        return lambda: ApiResource(self, name)
+
+    def _thread_http(self):
+        """Возвращает HTTP-транспорт текущего потока или None, если используется транспорт службы."""
+        if self._injected or self.http_factory is None:
+            return None
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.http = self.http_factory()
+            self._local.pid = os.getpid()
+        return self._local.http
+
+    def _send(self, request: ApiRequest, etag: str | None = None) -> dict:
+        """Отправляет запрос через googleapiclient с повторами при временных сбоях и ограничениях частоты."""
+        def attempt() -> dict:
+            stats.charge(request.resource, request.method)
+            http_request = getattr(getattr(self.service, request.resource)(), request.method)(**request.params)
+            if etag:
+                http_request.headers['If-None-Match'] = etag
+            http = self._thread_http()
+            return http_request.execute(http=http) if http is not None else http_request.execute()
+
+        return self.executor.call(attempt)
+
+    def execute(self, request: ApiRequest) -> dict:
+        """
+        Выполняет запрос, используя кэш, если он подключен.
+
+        Свежий ответ возвращается из кэша без обращения к сети. Для устаревшего ответа
+        отправляется запрос с заголовком `If-None-Match`, и при ответе 304 используется кэш.
+
+        Если активен сборщик статистики (см. src.stats.youtube_stats), запрос записывается в него.
+
+        :param request: Запрос к API.
+        :return: Ответ API.
+        """
+        if self.broker is not None:
+            return self.broker.execute(request, self._execute_recorded)
+        return self._execute_recorded(request)
+
+    def _execute_recorded(self, request: ApiRequest) -> dict:
+        """Выполняет запрос и записывает его в активные сборщики статистики."""
+        start = time.perf_counter()
+        response, cache = self._execute(request)
+        if stats.active():
+            stats.record(request.resource, request.method, request.params, response,
+                         time.perf_counter() - start, cache)
+        return response
+
+    def _execute(self, request: ApiRequest) -> tuple[dict, str]:
+        """Выполняет запрос и возвращает ответ и результат обращения к кэшу."""
+        if self.cache is None:
+            return self._send(request), 'off'
+
+        key = self.cache.make_key(request.resource, request.method, request.params)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl_for(request.resource, request.params)):
+            return entry.response, 'hit'
+
+        try:
+            response = self._send(request, entry.etag if entry is not None else None)
+        except Exception as error:
+            if entry is not None and is_not_modified(error):
+                self.cache.touch(key)
+                return entry.response, 'revalidated'
+            raise
+        self.cache.set(key, response)
+        return response, 'miss'
 
-from googleapiclient.discovery import build
 
 class YouTubeMixin:
     """
@@ -9,7 +263,38 @@ class YouTubeMixin:
 
         Attributes:
             API_KEY (str): Ключ YouTube API, полученный из среды.
-            YOUTUBE: Объект службы API YouTube.
+            YOUTUBE (ApiClient): Клиент API YouTube.
+
+        Если задана переменная среды YOUTUBE_CACHE, ответы API кэшируются в файле SQLite по этому пути.
     """
     API_KEY = os.getenv('API_KEY')
-    YOUTUBE = build('youtube', 'v3', developerKey=API_KEY)
+    YOUTUBE = ApiClient(cache=SQLiteCache(os.environ['YOUTUBE_CACHE']) if os.getenv('YOUTUBE_CACHE') else None)
+
+    @classmethod
+    def set_service(cls, service) -> None:
+        """
+        Подставляет объект службы API YouTube для всех классов проекта.
+
+        :param service: Объект с интерфейсом googleapiclient (например, созданный
+            build_service(http=...) с локальным транспортом) или None для службы по умолчанию.
+        """
+        cls.YOUTUBE.service = service
+
+    @classmethod
+    def set_broker(cls, broker: RequestBroker | None) -> None:
+        """
+        Задает посредника запросов для всех классов проекта.
+
+        :param broker: Например RequestBroker(batch_window=0.005), чтобы объединять одиночные
+            запросы видео и каналов из разных потоков, или None, чтобы отключить посредника.
+        """
+        cls.YOUTUBE.broker = broker
+
+    @classmethod
+    def set_cache(cls, cache: ResponseCache | None) -> None:
+        """
+        Подключает кэш ответов API для всех классов проекта.
+
+        :param cache: Кэш ответов или None, чтобы отключить кэширование.
+        """
+        cls.YOUTUBE.cache = cache
@@ -0,0 +1,44 @@
+"""
+Проверки массового сбора (src.crawl) на синтетическом API: возобновление после сбоя.
+
+Запуск:
+    python -m pytest -q tests
+"""
+import collections
+import io
+import json
+
+import pytest
+
+from src.crawl import crawl
+from src.replay import SyntheticHttp
+from src.youtube import YouTubeMixin, build_service
+
+
+@pytest.fixture(autouse=True)
+def synthetic(monkeypatch):
+    """Направляет запросы в синтетический API без кэша."""
+    monkeypatch.setenv('API_KEY', 'test')
+    monkeypatch.setattr(YouTubeMixin.YOUTUBE, 'cache', None)
+    YouTubeMixin.set_service(build_service(http=SyntheticHttp(playlist_size=60)))
+    yield
+    YouTubeMixin.set_service(None)
+
+
+def rows_per_channel(path):
+    with open(path, encoding='utf-8') as f:
+        return collections.Counter(json.loads(line)['channel_id'] for line in f)
+
+
+def test_resume_after_crash_does_not_duplicate_rows(tmp_path):
+    output, checkpoint = str(tmp_path / 'videos.ndjson'), str(tmp_path / 'videos.done')
+    assert crawl(['UC1', 'UC2'], output, checkpoint, workers=1, log=io.StringIO()) == 120
+
+    # Сбой после записи части строк канала UC3, но до его отметки в файле контрольных точек.
+    with open(output, encoding='utf-8') as f:
+        row = json.loads(f.readline())
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({**row, 'channel_id': 'UC3'}) + '\n' + '{"channel_id": "UC3", "vid')
+
+    assert crawl(['UC1', 'UC2', 'UC3'], output, checkpoint, workers=1, log=io.StringIO()) == 60
+    assert rows_per_channel(output) == {'UC1': 60, 'UC2': 60, 'UC3': 60}
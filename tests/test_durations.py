@@ -0,0 +1,52 @@
+"""
+Проверки разбора длительностей ISO 8601 (parse_duration): быстрый путь и передача в isodate.
+
+Запуск:
+    python -m pytest -q tests
+"""
+import pytest
+
+from src import durations
+from src.durations import parse_duration
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """Записывает строки, переданные в isodate, и возвращает для них -1."""
+    calls = []
+
+    def parse(value):
+        calls.append(value)
+        return -1
+
+    monkeypatch.setattr(durations, '_parse_with_isodate', parse)
+    return calls
+
+
+@pytest.mark.parametrize('value, seconds', [
+    ('PT1H2M3S', 3723),
+    ('PT15M', 900),
+    ('PT45S', 45),
+    ('P0D', 0),
+    ('P1DT2H', 93600),
+    ('P2D', 172800),
+    ('PT0S', 0),
+])
+def test_fast_path(value, seconds, fallback):
+    assert parse_duration(value) == seconds
+    assert fallback == []
+
+
+@pytest.mark.parametrize('value', ['P', 'PT', 'P1DT', 'PT1S2H', 'PT1M1M', 'PT1H2', 'P1W', 'PT1.5S', '1H'])
+def test_malformed_or_rare_forms_fall_back(value, fallback):
+    assert parse_duration(value) == -1
+    assert fallback == [value]
+
+
+def test_isodate_fallback():
+    pytest.importorskip('isodate')
+    assert parse_duration('P1W') == 7 * 86400
+    assert parse_duration('PT1.5S') == 1
+    for value in ('P', 'PT1S2H'):
+        with pytest.raises(ValueError):
+            parse_duration(value)
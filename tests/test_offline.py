@@ -0,0 +1,136 @@
+"""
+Проверки классов проекта без сети: на синтетическом API (SyntheticHttp) и на кассете
+(RecordingHttp/ReplayHttp), а также сравнение количества запросов с базовыми результатами бенчмарка.
+
+Запуск:
+    python -m pytest -q tests
+"""
+import json
+import os
+
+import pytest
+
+from src import bench
+from src.cache import SQLiteCache
+from src.channel import Channel
+from src.durations import DurationIndex
+from src.playlist import PlayList
+from src.replay import RecordingHttp, ReplayHttp, SyntheticHttp
+from src.stats import youtube_stats
+from src.video import Video
+from src.youtube import YouTubeMixin, build_service
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'bench_baseline.json')
+BASELINE_SIZE = 200
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Подставляет ключ API, отключает кэш и использует собственный индекс длительностей."""
+    monkeypatch.setenv('API_KEY', 'test')
+    monkeypatch.setattr(YouTubeMixin.YOUTUBE, 'cache', None)
+    monkeypatch.setattr(PlayList, 'DURATIONS', DurationIndex())
+    yield
+    YouTubeMixin.set_service(None)
+
+
+def use(http):
+    """Направляет запросы всех классов проекта в транспорт http."""
+    YouTubeMixin.set_service(build_service(http=http))
+    return http
+
+
+def test_video_bulk_batches_ids():
+    use(SyntheticHttp())
+    with youtube_stats() as stats:
+        videos = Video.bulk([f'v{number}' for number in range(120)] + ['missing1'])
+    assert stats.network_calls == 3
+    assert videos[0].title == 'Video v0'
+    assert videos[-1].title is None
+    assert videos[0].to_record().comment_count == int(videos[0].comment_count)
+    assert stats.network_calls == 3
+
+
+def test_extra_fields_are_loaded_in_batches():
+    use(SyntheticHttp())
+    videos = Video.bulk([f'v{number}' for number in range(100)])
+    with youtube_stats() as stats:
+        published = [(video.description, video.published_at) for video in videos]
+    assert stats.network_calls == 2
+    assert published[0] == ('Description of v0', Video('v0').published_at)
+
+
+def test_lazy_channels_share_requests():
+    use(SyntheticHttp())
+    channels = [Channel.lazy(f'UC{number}') for number in range(60)]
+    with youtube_stats() as stats:
+        titles = [channel.title for channel in channels]
+    assert stats.network_calls == 2
+    assert titles[5] == 'Channel UC5'
+    assert channels[0].uploads_playlist_id == 'UU0'
+
+
+def test_print_info_does_not_call_api(capsys):
+    use(SyntheticHttp())
+    channel = Channel('UCprint')
+    with youtube_stats() as stats:
+        channel.print_info()
+    assert stats.network_calls == 0
+    assert json.loads(capsys.readouterr().out) == channel.channel_response
+
+
+def test_playlist_pages_and_invalidate():
+    http = use(SyntheticHttp(playlist_size=120))
+    playlist = PlayList('PLtest')
+    assert len(playlist.videos_id) == 120
+    assert playlist.show_best_video().startswith('https://youtu.be/test-')
+    http.playlist_size = 30
+    playlist.invalidate()
+    assert len(playlist.videos_id) == 30
+    assert playlist.total_duration.total_seconds() > 0
+
+
+def test_lazy_playlist_loads_only_accessed_one():
+    use(SyntheticHttp(playlist_size=3))
+    playlists = [PlayList.lazy(f'PL{number}') for number in range(10)]
+    with youtube_stats() as stats:
+        assert playlists[3].title
+    assert stats.network_calls == 1
+    assert not playlists[4].is_loaded
+
+
+def test_cached_playlist_page_expires_quickly(tmp_path, monkeypatch):
+    http = use(SyntheticHttp(playlist_size=3))
+    cache = SQLiteCache(str(tmp_path / 'cache.db'))
+    monkeypatch.setattr(YouTubeMixin.YOUTUBE, 'cache', cache)
+    assert cache.ttl_for('playlistItems', {'part': PlayList.ITEM_PARTS}) == 15 * 60
+    assert len(PlayList('PLcache').videos_id) == 3
+
+    http.playlist_size = 5
+    assert len(PlayList('PLcache').videos_id) == 3
+    cache._db.execute('UPDATE responses SET stored_at = stored_at - 16 * 60')
+    cache._db.commit()
+    assert len(PlayList('PLcache').videos_id) == 5
+
+
+def test_replay_matches_recording(tmp_path):
+    cassette = str(tmp_path / 'cassette.json.gz')
+    recorder = use(RecordingHttp(cassette, http=SyntheticHttp(playlist_size=70)))
+    recorded = (Channel('UCreplay').to_dict(), PlayList('PLreplay').total_duration,
+                [video.to_dict() for video in Video.bulk(['a', 'b'])])
+    recorder.save()
+
+    use(ReplayHttp(cassette))
+    replayed = (Channel('UCreplay').to_dict(), PlayList('PLreplay').total_duration,
+                [video.to_dict() for video in Video.bulk(['a', 'b'])])
+    assert replayed == recorded
+    with pytest.raises(KeyError):
+        Video('unknown')
+
+
+def test_benchmark_calls_do_not_regress():
+    with open(BASELINE, encoding='utf-8') as f:
+        baseline = json.load(f)
+    results = bench.run(size=BASELINE_SIZE, repeat=1)
+    # Время и память зависят от машины, поэтому здесь сравнивается только количество запросов.
+    assert bench.compare(results, baseline, tolerance=float('inf')) == []
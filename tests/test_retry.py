@@ -0,0 +1,149 @@
+"""
+Проверки слоя повторов (src.retry) на поддельных HttpError и без реальных задержек.
+
+Запуск:
+    python -m pytest -q tests
+"""
+import json
+
+import pytest
+
+from src.retry import (AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, QuotaExhaustedError,
+                       ResilientExecutor, classify)
+
+
+class FakeResponse(dict):
+    """Заголовки ответа со статусом, как httplib2.Response."""
+    def __init__(self, status, headers=None):
+        super().__init__(headers or {})
+        self.status = status
+
+
+class FakeHttpError(Exception):
+    """Ошибка с полями resp и content, как googleapiclient.errors.HttpError."""
+    def __init__(self, status, reason=None, headers=None):
+        super().__init__(f'HTTP {status} {reason}')
+        self.resp = FakeResponse(status, headers)
+        errors = [{'reason': reason}] if reason else []
+        self.content = json.dumps({'error': {'code': status, 'errors': errors}}).encode()
+
+
+def make_executor(**kwargs):
+    """Создает исполнитель, который записывает задержки вместо сна."""
+    kwargs.setdefault('limiter', AdaptiveRateLimiter(throttle_rate=1000))
+    executor = ResilientExecutor(**kwargs)
+    executor.delays = []
+    executor.sleep = executor.delays.append
+    return executor
+
+
+def failing(*errors, response=None):
+    """Возвращает функцию запроса, которая по очереди выбрасывает errors, а затем возвращает response."""
+    errors = list(errors)
+    calls = []
+
+    def send():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return response if response is not None else {'items': []}
+
+    send.calls = calls
+    return send
+
+
+@pytest.mark.parametrize('error, kind', [
+    (FakeHttpError(403, 'quotaExceeded'), 'quota'),
+    (FakeHttpError(403, 'dailyLimitExceeded'), 'quota'),
+    (FakeHttpError(403, 'rateLimitExceeded'), 'throttle'),
+    (FakeHttpError(429), 'throttle'),
+    (FakeHttpError(500), 'transient'),
+    (FakeHttpError(503, 'backendError'), 'transient'),
+    (FakeHttpError(403, 'forbidden'), None),
+    (FakeHttpError(404, 'notFound'), None),
+    (ConnectionResetError(), 'transient'),
+    (TimeoutError(), 'transient'),
+    (FileNotFoundError(), None),
+])
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_transient_errors_are_retried():
+    executor = make_executor()
+    send = failing(FakeHttpError(500), FakeHttpError(503), response={'items': [1]})
+    assert executor.call(send) == {'items': [1]}
+    assert len(send.calls) == 3
+    assert len(executor.delays) == 2
+    assert all(0 <= delay <= executor.max_delay for delay in executor.delays)
+
+
+def test_throttle_lowers_rate_and_retries():
+    executor = make_executor()
+    assert executor.call(failing(FakeHttpError(429))) == {'items': []}
+    assert executor.limiter.rate is not None
+    assert executor.breaker.failures == 0
+
+
+def test_retry_after_header_sets_delay():
+    executor = make_executor(max_delay=10)
+    executor.call(failing(FakeHttpError(503, headers={'retry-after': '3'}),
+                          FakeHttpError(503, headers={'retry-after': '120'})))
+    assert executor.delays == [3, 10]
+
+
+def test_non_retryable_error_is_raised_immediately():
+    executor = make_executor()
+    send = failing(FakeHttpError(404, 'notFound'))
+    with pytest.raises(FakeHttpError):
+        executor.call(send)
+    assert len(send.calls) == 1
+
+
+def test_attempts_are_limited():
+    executor = make_executor(max_attempts=3, breaker=CircuitBreaker(failure_threshold=10))
+    send = failing(*[FakeHttpError(500)] * 5)
+    with pytest.raises(FakeHttpError):
+        executor.call(send)
+    assert len(send.calls) == 3
+
+
+def test_quota_exhaustion_fails_fast():
+    executor = make_executor()
+    first = failing(FakeHttpError(403, 'quotaExceeded'))
+    with pytest.raises(QuotaExhaustedError):
+        executor.call(first)
+    assert len(first.calls) == 1
+    assert executor.delays == []
+
+    second = failing()
+    with pytest.raises(QuotaExhaustedError):
+        executor.call(second)
+    assert second.calls == []
+
+    executor.quota_exhausted_until = 0
+    assert executor.call(second) == {'items': []}
+
+
+def test_breaker_opens_and_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    executor = make_executor(max_attempts=2, breaker=breaker)
+    with pytest.raises(FakeHttpError):
+        executor.call(failing(FakeHttpError(500), FakeHttpError(500)))
+    assert breaker.opened_at is not None
+
+    blocked = failing()
+    with pytest.raises(CircuitOpenError):
+        executor.call(blocked)
+    assert blocked.calls == []
+
+    breaker.opened_at -= 31
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.opened_at -= 31
+    probe = failing()
+    assert executor.call(probe) == {'items': []}
+    assert len(probe.calls) == 1
+    assert breaker.opened_at is None and breaker.failures == 0
@@ -0,0 +1,52 @@
+"""
+Проверки журнала статистики (TimeSeries): дозапись после сбоя и поиск истории по индексу снимков.
+
+Запуск:
+    python -m pytest -q tests
+"""
+import pytest
+
+from src.timeseries import RECORD, VIDEO_FIELDS, TimeSeries
+
+
+def test_torn_tail_is_truncated_before_append(tmp_path):
+    path = str(tmp_path / 'videos.bin')
+    TimeSeries(path, VIDEO_FIELDS).append([('a', 1, 2, 3), ('b', 4, 5, 6)], timestamp=100)
+    with open(path, 'ab') as f:
+        f.write(b'\xff' * 10)
+
+    series = TimeSeries(path, VIDEO_FIELDS)
+    assert series.append([('a', 7, 8, 9)], timestamp=200) == 1
+    assert (tmp_path / 'videos.bin').stat().st_size == 3 * RECORD.size
+    assert [point['view_count'] for point in series.history('a')] == [1, 7]
+    with pytest.raises(ValueError):
+        series.append([('a', 0, 0, 0)], timestamp=150)
+
+
+def test_snapshot_missing_from_index_is_recovered(tmp_path):
+    path = str(tmp_path / 'videos.bin')
+    TimeSeries(path, VIDEO_FIELDS).append([('b', 1, 0, 0), ('a', 2, 0, 0)], timestamp=100)
+    TimeSeries(path, VIDEO_FIELDS).append([('a', 3, 0, 0)], timestamp=200)
+    with open(path + '.idx', 'r+b') as f:
+        f.truncate(f.seek(0, 2) - 5)
+
+    series = TimeSeries(path, VIDEO_FIELDS)
+    series.append([('a', 4, 0, 0)], timestamp=300)
+    assert [point['view_count'] for point in series.history('a')] == [2, 3, 4]
+
+
+def test_history_finds_entity_in_each_snapshot(tmp_path):
+    series = TimeSeries(str(tmp_path / 'videos.bin'), VIDEO_FIELDS)
+    ids = [f'v{number:03}' for number in range(200)]
+    for hour in range(5):
+        series.append([(video_id, hour * 10 + number, 0, 0) for number, video_id in enumerate(reversed(ids))],
+                      timestamp=hour * 3600)
+    series.append([('v150', 1000, 0, 0)], timestamp=4 * 3600)
+
+    history = series.history('v150', since=3600, until=4 * 3600 + 1)
+    assert [point['timestamp'] for point in history] == [3600, 7200, 10800, 14400]
+    assert history[-1]['view_count'] == 1000
+    assert series.history('v150', step=7200)[0] == {'timestamp': 0, 'view_count': 59, 'like_count': 0,
+                                                    'comment_count': 0}
+    assert series.history('missing') == []
+    assert len(list(series.scan(since=3600, until=7200))) == 200